@@ -0,0 +1,87 @@
+"""
+Benchmark document assembly with python-docx against the direct OOXML writer.
+
+Cards are rendered once up front so only assembly is timed.
+
+Usage: python benchmarks/bench_document_writers.py [num_cards ...]
+"""
+
+import os
+import sys
+import time
+import tempfile
+from docx import Document
+from docx.shared import Cm, Inches
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from card_template import compile_template
+from ooxml_writer import OoxmlDocumentWriter
+
+ROWS, COLS = 4, 2
+
+
+def new_document():
+    """A4 document with the same margins generate_cards() uses."""
+    doc = Document()
+    section = doc.sections[0]
+    section.page_height = Cm(29.7)
+    section.page_width = Cm(21.0)
+    section.left_margin = section.right_margin = Cm(0.8)
+    section.top_margin = section.bottom_margin = Cm(0.8)
+    return doc
+
+
+def assemble_python_docx(images, output_file):
+    doc = new_document()
+    for i in range(0, len(images), ROWS * COLS):
+        if i > 0:
+            doc.add_page_break()
+        table = doc.add_table(rows=ROWS, cols=COLS)
+        table.style = 'Table Grid'
+        table.autofit = False
+        for img_index, path in enumerate(images[i:i + ROWS * COLS]):
+            cell = table.cell(img_index // COLS, img_index % COLS)
+            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            cell.paragraphs[0].add_run().add_picture(path, width=Inches(2.5))
+    doc.save(output_file)
+
+
+def assemble_ooxml(images, output_file, card_size):
+    section = new_document().sections[0]
+    writer = OoxmlDocumentWriter(output_file, section.page_width, section.page_height,
+                                 section.left_margin, section.right_margin,
+                                 section.top_margin, section.bottom_margin)
+    for i in range(0, len(images), ROWS * COLS):
+        writer.add_card_table(images[i:i + ROWS * COLS], ROWS, COLS, card_size, Inches(2.5))
+    writer.save()
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [500, 1000, 2000]
+    plan = compile_template(None, 'resources/logo.png')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Unique cards, since python-docx stores identical images only once
+        images = []
+        for i in range(max(sizes)):
+            path = os.path.join(tmp, f'card_{i}.jpg')
+            plan.render({'LAABHARTHI_NAME': f'Card {i}', 'CONTACT_NUMBER': str(9000000000 + i),
+                         'ARPIT_GROUP': 'Group A', 'AREA': 'Delhi'}).save(path)
+            images.append(path)
+
+        print(f"{'cards':>8}{'python-docx s':>16}{'ooxml s':>10}{'speedup':>10}")
+        for n in sizes:
+            start = time.perf_counter()
+            assemble_python_docx(images[:n], os.path.join(tmp, 'python_docx.docx'))
+            python_docx_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            assemble_ooxml(images[:n], os.path.join(tmp, 'ooxml.docx'), plan.size)
+            ooxml_time = time.perf_counter() - start
+
+            print(f"{n:>8}{python_docx_time:>16.2f}{ooxml_time:>10.2f}{python_docx_time / ooxml_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
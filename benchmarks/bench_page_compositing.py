@@ -0,0 +1,57 @@
+"""
+Benchmark per-card embedding against composited pages.
+
+Usage: python benchmarks/bench_page_compositing.py [num_cards] [rows] [cols]
+"""
+
+import os
+import sys
+import time
+import zipfile
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generate_cards import generate_cards
+
+
+def make_csv(path, num_cards):
+    """Write a CSV with num_cards unique records built from the sample data."""
+    sample = pd.read_csv(os.path.join(os.path.dirname(__file__), '..', 'data', 'sample_data.csv'))
+    repeats = -(-num_cards // len(sample))
+    df = pd.concat([sample] * repeats).head(num_cards).reset_index(drop=True)
+    # Unique names so identical card images are not deduplicated by python-docx
+    df['LAABHARTHI_NAME'] = df['LAABHARTHI_NAME'] + ' ' + df.index.astype(str)
+    df.to_csv(path, index=False)
+
+
+def describe_docx(path):
+    """Return (file size, media parts, document.xml size) of a .docx."""
+    with zipfile.ZipFile(path) as z:
+        media = [n for n in z.namelist() if n.startswith('word/media/')]
+        document_xml = z.getinfo('word/document.xml').file_size
+    return os.path.getsize(path), len(media), document_xml
+
+
+def main():
+    num_cards = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    cols = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, 'cards.csv')
+        make_csv(csv_file, num_cards)
+
+        print(f"{num_cards} cards, {rows}x{cols} per page")
+        print(f"{'mode':<12}{'seconds':>10}{'docx bytes':>14}{'media':>8}{'xml bytes':>12}")
+        for mode, composite in [('per-card', False), ('composite', True)]:
+            output_file = os.path.join(tmp, f'{mode}.docx')
+            start = time.perf_counter()
+            generate_cards(csv_file, output_file, rows, cols, composite_pages=composite)
+            elapsed = time.perf_counter() - start
+            size, media, xml = describe_docx(output_file)
+            print(f"{mode:<12}{elapsed:>10.2f}{size:>14}{media:>8}{xml:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark returning rendered cards from worker processes through shared memory
+against pickling them back to the parent.
+
+Both paths composite every card into a page buffer in the parent, as
+generate_cards(composite_pages=True) does.
+
+Usage: python benchmarks/bench_shm_transport.py [num_cards] [processes]
+"""
+
+import os
+import sys
+import time
+import multiprocessing
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from card_template import compile_template
+from page_compositor import PageLayout, PageCompositor
+from shm_transport import render_shared
+
+LOGO = 'resources/logo.png'
+_plan = None
+
+
+def _init_pickle_worker():
+    global _plan
+    _plan = compile_template(None, LOGO)
+
+
+def _render_pickled(record):
+    """Pickle path: the whole image crosses the process boundary."""
+    return _plan.render(record)
+
+
+def make_records(num_cards):
+    return [{'LAABHARTHI_NAME': f'Card {i}', 'CONTACT_NUMBER': str(9000000000 + i),
+             'ARPIT_GROUP': 'Group A', 'AREA': 'Delhi'} for i in range(num_cards)]
+
+
+def main():
+    num_cards = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    records = make_records(num_cards)
+    plan = compile_template(None, LOGO)
+    compositor = PageCompositor(PageLayout(7.6, 10.8, 4, 2, plan.size))
+    card_bytes = plan.size[0] * plan.size[1] * 3
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes, initializer=_init_pickle_worker) as pool:
+        for index, img in enumerate(pool.imap(_render_pickled, records, chunksize=8)):
+            compositor.place(index % 8, np.asarray(img))
+    pickle_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    render_shared(records, None, LOGO, plan.size,
+                  lambda index, record, card, fitted: compositor.place(index % 8, card),
+                  processes=processes)
+    shared_time = time.perf_counter() - start
+
+    print(f"{num_cards} cards of {card_bytes} bytes, {processes} worker processes")
+    print(f"{'transport':<14}{'seconds':>10}{'cards/s':>10}{'pixel MB pickled':>18}")
+    print(f"{'pickle':<14}{pickle_time:>10.2f}{num_cards / pickle_time:>10.0f}{num_cards * card_bytes / 1e6:>18.0f}")
+    print(f"{'shared memory':<14}{shared_time:>10.2f}{num_cards / shared_time:>10.0f}{0:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+import os
+import json
+from collections import OrderedDict
+from PIL import Image, ImageDraw, ImageFont
+
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'default_card.json')
+
+
+def load_template(template_path=None):
+    """Load a card template (JSON) from disk, falling back to the default layout."""
+    with open(template_path or DEFAULT_TEMPLATE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_font(path, size):
+    """Load a TrueType font, falling back to Pillow's default font at the same size."""
+    try:
+        return ImageFont.truetype(path, size)
+    except IOError:
+        # Sized default font (Pillow >= 10.1), so shrink-to-fit still works
+        # when the template fonts are not installed
+        return ImageFont.load_default(size)
+
+
+class FontCache:
+    """
+    Cache of loaded fonts per (path, size) and of measured text widths.
+
+    Widths are keyed on every distinct value and probed size, so they are kept
+    in a least recently used cache of at most max_widths entries.
+    """
+
+    def __init__(self, max_widths=100000):
+        self.fonts = {}
+        self.widths = OrderedDict()
+        self.max_widths = max_widths
+
+    def font(self, path, size):
+        key = (path, size)
+        if key not in self.fonts:
+            self.fonts[key] = load_font(path, size)
+        return self.fonts[key]
+
+    def width(self, path, size, text):
+        key = (path, size, text)
+        if key in self.widths:
+            self.widths.move_to_end(key)
+            return self.widths[key]
+        width = self.widths[key] = self.font(path, size).getlength(text)
+        if len(self.widths) > self.max_widths:
+            self.widths.popitem(last=False)
+        return width
+
+    def fit(self, text, path, size, max_width, min_size):
+        """
+        Fit text into max_width pixels, shrinking the font down to min_size and
+        truncating with an ellipsis if that is still not enough.
+
+        Returns:
+            (font, text, size, truncated)
+        """
+        if self.width(path, size, text) <= max_width:
+            return self.font(path, size), text, size, False
+
+        # Width scales roughly linearly with size, so start from the estimate
+        # and correct it in either direction instead of trying every size
+        estimate = int(size * max_width / self.width(path, size, text))
+        fit_size = max(min_size, min(size - 1, estimate))
+        while fit_size < size - 1 and self.width(path, fit_size + 1, text) <= max_width:
+            fit_size += 1
+        while fit_size > min_size and self.width(path, fit_size, text) > max_width:
+            fit_size -= 1
+        if self.width(path, fit_size, text) <= max_width:
+            return self.font(path, fit_size), text, fit_size, False
+
+        # Still too wide at the minimum size: truncate
+        ellipsis = '...'
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.width(path, fit_size, text[:mid].rstrip() + ellipsis) <= max_width:
+                lo = mid
+            else:
+                hi = mid - 1
+        return self.font(path, fit_size), text[:lo].rstrip() + ellipsis, fit_size, True
+
+
+# Shared across plans so repeated runs (and grouped documents) reuse measurements
+FONT_CACHE = FontCache()
+
+
+def _color(template, value):
+    """Resolve a named template color or an explicit [r, g, b] list."""
+    if isinstance(value, str) and value in template.get('colors', {}):
+        value = template['colors'][value]
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _draw_border(draw, width, height, color, border_width, corner):
+    """Draw the ornate border with decorative corner elements."""
+    draw.rectangle([0, 0, width-1, height-1], outline=color, width=border_width)
+
+    half = border_width // 2
+    right, bottom = width - 1, height - 1
+    # Top-left
+    draw.line([(0, 0), (corner, 0)], fill=color, width=half)
+    draw.line([(0, 0), (0, corner)], fill=color, width=half)
+    # Top-right
+    draw.line([(right, 0), (right-corner, 0)], fill=color, width=half)
+    draw.line([(right, 0), (right, corner)], fill=color, width=half)
+    # Bottom-left
+    draw.line([(0, bottom), (corner, bottom)], fill=color, width=half)
+    draw.line([(0, bottom), (0, bottom-corner)], fill=color, width=half)
+    # Bottom-right
+    draw.line([(right, bottom), (right-corner, bottom)], fill=color, width=half)
+    draw.line([(right, bottom), (right, bottom-corner)], fill=color, width=half)
+
+
+class RenderPlan:
+    """A compiled card template: static layers baked into a base image plus field slots."""
+
+    def __init__(self, base, slots):
+        self.base = base
+        self.slots = slots
+
+    @property
+    def size(self):
+        return self.base.size
+
+    def render(self, data, overflow=None):
+        """
+        Render a single record onto a copy of the precomputed base image.
+
+        Values wider than their slot are shrunk (and truncated if needed).
+        If an overflow list is given, one entry is appended per adjusted field.
+        """
+        img = self.base.copy()
+        draw = ImageDraw.Draw(img)
+        for slot in self.slots:
+            text = str(data.get(slot['column'], ''))
+            font, fitted, size, truncated = FONT_CACHE.fit(
+                text, slot['font_path'], slot['font_size'], slot['max_width'], slot['min_size'])
+            draw.text(slot['xy'], fitted, font=font, fill=slot['color'])
+            if overflow is not None and (size != slot['font_size'] or truncated):
+                overflow.append({
+                    'column': slot['column'],
+                    'text': text,
+                    'font_size': size,
+                    'truncated': truncated,
+                })
+        return img
+
+
+def compile_template(template, logo_path=None, size=None):
+    """
+    Compile a template into a RenderPlan.
+
+    Fonts are loaded, static text is measured and all static layers (border,
+    logo, fixed text, field labels and rules) are drawn once into the base image.
+
+    Args:
+        template: Template dict (see load_template) or path to a template file
+        logo_path: Logo image used by 'logo' layers
+        size: Optional (width, height) overriding the template size
+    Returns:
+        RenderPlan ready to be applied to each record
+    """
+    if template is None or isinstance(template, str):
+        template = load_template(template)
+
+    width, height = size or template.get('size', (800, 400))
+    base = Image.new('RGB', (width, height), color=template.get('background', 'white'))
+    draw = ImageDraw.Draw(base)
+
+    font_specs = template.get('fonts', {})
+    fonts = {name: FONT_CACHE.font(spec['path'], spec['size']) for name, spec in font_specs.items()}
+
+    # Column boundaries: text fields on the left, logo and amount on the right
+    left_width = int(width * template.get('split', 0.65))
+    columns = {'left': (0, left_width), 'right': (left_width, width), 'full': (0, width)}
+
+    for layer in template.get('layers', []):
+        kind = layer['type']
+        col_start, col_end = columns[layer.get('column', 'full')]
+
+        if kind == 'border':
+            _draw_border(draw, width, height, _color(template, layer['color']), layer['width'], layer['corner'])
+
+        elif kind == 'logo':
+            if logo_path and os.path.exists(logo_path):
+                logo_size = layer['size']
+                logo = Image.open(logo_path).resize((logo_size, logo_size), Image.LANCZOS)
+                logo_x = col_start + (col_end - col_start - logo_size) // 2
+                base.paste(logo, (logo_x, layer['y']), logo if logo.mode == 'RGBA' else None)
+
+        elif kind == 'text':
+            font = fonts[layer['font']]
+            text = layer['text']
+            x = layer.get('x', col_start)
+            if layer.get('align') == 'center':
+                bbox = draw.textbbox((0, 0), text, font=font)
+                x = col_start + (col_end - col_start - (bbox[2] - bbox[0])) // 2
+            draw.text((x, layer['y']), text, font=font, fill=_color(template, layer['color']))
+
+        else:
+            raise ValueError(f"Unknown template layer type: {kind}")
+
+    # Field slots: labels and rules are static, only the values change per record
+    fields = template.get('fields', {})
+    x = fields.get('x', 40)
+    y_start = fields.get('y', 80)
+    line_height = fields.get('line_height', 50)
+    max_width = fields.get('max_width', left_width - 2*x)
+    min_size = fields.get('min_font_size', 14)
+    label_font = fonts[fields['label_font']]
+    label_color = _color(template, fields['label_color'])
+    rule_color = _color(template, fields['rule_color'])
+
+    slots = []
+    for i, slot in enumerate(fields.get('slots', [])):
+        y = y_start + i*line_height
+        draw.text((x, y), slot['label'], font=label_font, fill=label_color)
+
+        line_y = y_start + (i+1)*line_height + fields.get('rule_offset', 20)
+        draw.line([(x, line_y), (left_width-x, line_y)], fill=rule_color, width=2)
+
+        font_spec = font_specs[slot.get('font', fields['value_font'])]
+        slots.append({
+            'column': slot['column'],
+            'xy': (x, y + fields.get('value_offset', 35)),
+            'font_path': font_spec['path'],
+            'font_size': font_spec['size'],
+            'max_width': slot.get('max_width', max_width),
+            'min_size': slot.get('min_font_size', min_size),
+            'color': _color(template, slot.get('color', fields['value_color'])),
+        })
+
+    return RenderPlan(base, slots)
@@ -0,0 +1,113 @@
+import os
+import json
+import hashlib
+
+MANIFEST_NAME = 'manifest.json'
+OVERFLOWS_NAME = 'overflows.jsonl'
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def run_fingerprint(csv_file, options, files=()):
+    """
+    Fingerprint a generation run from its input data, options and any files
+    (template, logo) that affect the rendered output.
+
+    A checkpoint can only be resumed by a run with the same fingerprint.
+    """
+    digest = hashlib.sha256()
+    digest.update(file_digest(csv_file).encode())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    for path in files:
+        digest.update(file_digest(path).encode() if path and os.path.exists(path) else b'-')
+    return digest.hexdigest()
+
+
+def load_manifest(checkpoint_dir):
+    """Load the checkpoint manifest, or None if there is no readable manifest."""
+    try:
+        with open(os.path.join(checkpoint_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(checkpoint_dir, manifest):
+    """Write the manifest atomically so an interrupted write never corrupts it."""
+    path = os.path.join(checkpoint_dir, MANIFEST_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def completed_pages(manifest, fingerprint, page_images):
+    """
+    Return how many pages a matching manifest recorded as complete.
+
+    Args:
+        manifest: Loaded manifest (or None)
+        fingerprint: Fingerprint of the current run
+        page_images: Function mapping a page number to its image paths
+    Returns:
+        Number of completed pages whose images are all still on disk,
+        or None if the manifest belongs to a different run
+    """
+    if manifest is None:
+        return 0
+    if manifest.get('fingerprint') != fingerprint:
+        return None
+    # Only trust the prefix of pages whose images are all still on disk
+    for page_num in range(manifest.get('completed_pages', 0)):
+        if not all(os.path.exists(path) for path in page_images(page_num)):
+            return page_num
+    return manifest.get('completed_pages', 0)
+
+
+def append_overflows(checkpoint_dir, rows):
+    """Append the overflow rows of a completed page, one JSON line per row."""
+    with open(os.path.join(checkpoint_dir, OVERFLOWS_NAME), 'a', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row) + '\n')
+
+
+def restore_overflows(checkpoint_dir, num_records):
+    """
+    Return the logged overflow rows of the first num_records records and
+    truncate the log to them, dropping rows of pages that were not completed.
+    """
+    path = os.path.join(checkpoint_dir, OVERFLOWS_NAME)
+    rows = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            rows = [row for row in map(json.loads, f) if row[0] < num_records]
+    except (OSError, ValueError):
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row) + '\n')
+    return rows
+
+
+def remove_checkpoint(checkpoint_dir, files):
+    """
+    Delete the given files, the manifest and the overflow log, then the
+    directory itself if nothing else is left in it.
+    """
+    for path in list(files) + [os.path.join(checkpoint_dir, name) for name in (MANIFEST_NAME, OVERFLOWS_NAME)]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    try:
+        os.rmdir(checkpoint_dir)
+    except OSError:
+        # Not empty: leave files this run did not create alone
+        pass
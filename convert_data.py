@@ -1,6 +1,5 @@
 import pandas as pd
 import os
-import sys
 import math
 
 
@@ -18,7 +17,119 @@ def capitalize_words(text):
     return " ".join(word.capitalize() for word in str(text).split())
 
 
-def process_csv_in_batches(input_file, output_prefix="processed_data", batch_size=300):
+# Fewer digits than this is not a phone number (e.g. "+91" when the WhatsApp number is missing)
+MIN_CONTACT_DIGITS = 7
+
+
+def normalize_contact(number):
+    """
+    Normalize a contact number for duplicate detection.
+
+    Keeps only digits and drops the country code, so "+91 98765-43210",
+    "919876543210" and "9876543210" all map to the same key. Numbers with
+    fewer than MIN_CONTACT_DIGITS digits are treated as missing ("").
+    """
+    if pd.isna(number):
+        return ""
+    digits = "".join(ch for ch in str(number) if ch.isdigit())
+    if len(digits) < MIN_CONTACT_DIGITS:
+        return ""
+    return digits[-10:]
+
+
+def phone_digits(values):
+    """
+    Keep every digit of a phone number column, so "98765-43210" and
+    "98765 43210" keep all their digits rather than only the first group.
+    Numbers read as floats ("9876543210.0") lose the ".0"; blanks become "".
+    """
+    return (
+        values.astype(str)
+        .str.replace(r"\.0$", "", regex=True)
+        .str.replace(r"\D", "", regex=True)
+        .fillna("")
+    )
+
+
+def normalize_name(name):
+    """Normalize a name for duplicate detection (case, dots and extra spaces ignored)."""
+    if pd.isna(name):
+        return ""
+    return " ".join(str(name).replace(".", " ").casefold().split())
+
+
+DEDUPE_POLICIES = ("keep_first", "keep_last", "report")
+
+
+def deduplicate_records(df, policy="keep_first", name_column="NAME", contact_column="CONTACT_NUMBER",
+                        id_column="ID"):
+    """
+    Detect duplicate registrations in a single pass using hash indexes.
+
+    A row is a duplicate of an earlier row when both the normalized contact
+    number and the normalized name match. Rows that share a contact number
+    but have a different name are reported as conflicts and always kept.
+    Rows without a usable contact number are never treated as duplicates,
+    since a name alone does not identify a person.
+
+    Args:
+        df (DataFrame): Records to check
+        policy (str): "keep_first", "keep_last" or "report" (keep every row)
+        name_column (str): Column holding the name
+        contact_column (str): Column holding the contact number
+        id_column (str): Column holding the record ID, reported next to the row positions
+    Returns:
+        (DataFrame, DataFrame): The deduplicated records and the conflict report
+    """
+    if policy not in DEDUPE_POLICIES:
+        raise ValueError(f"Unknown dedupe policy {policy!r}, expected one of {DEDUPE_POLICIES}")
+
+    kept = []            # row labels in output order
+    by_record = {}       # (contact, name) -> position in kept
+    by_contact = {}      # contact -> (first row label, normalized name)
+    conflicts = []
+
+    def record_id(label):
+        return df.at[label, id_column] if id_column in df.columns else ""
+
+    def add_conflict(kind, row, matches_row, name, contact, action):
+        conflicts.append([kind, row, record_id(row), matches_row, record_id(matches_row), name, contact, action])
+
+    for label, name, contact in zip(df.index, df[name_column], df[contact_column]):
+        name_key = normalize_name(name)
+        contact_key = normalize_contact(contact)
+        if not contact_key:
+            kept.append(label)
+            continue
+
+        key = (contact_key, name_key)
+        if key in by_record:
+            pos = by_record[key]
+            if policy == "keep_last":
+                dropped = kept[pos]
+                add_conflict("duplicate", dropped, label, df.at[dropped, name_column],
+                             df.at[dropped, contact_column], "dropped")
+                kept[pos] = label
+            else:
+                action = "dropped" if policy == "keep_first" else "kept"
+                add_conflict("duplicate", label, kept[pos], name, contact, action)
+                if policy == "report":
+                    kept.append(label)
+            continue
+
+        if contact_key in by_contact and by_contact[contact_key][1] != name_key:
+            add_conflict("contact_conflict", label, by_contact[contact_key][0], name, contact, "kept")
+        by_contact.setdefault(contact_key, (label, name_key))
+
+        by_record[key] = len(kept)
+        kept.append(label)
+
+    columns = ["KIND", "ROW", "ID", "MATCHES_ROW", "MATCHES_ID", "NAME", "CONTACT_NUMBER", "ACTION"]
+    return df.loc[kept], pd.DataFrame(conflicts, columns=columns)
+
+
+def process_csv_in_batches(input_file, output_prefix="processed_data", batch_size=300,
+                           dedupe=None, conflict_report=None):
     """
     Process CSV/Excel data with specific column transformations and save in batches.
 
@@ -26,6 +137,9 @@ def process_csv_in_batches(input_file, output_prefix="processed_data", batch_siz
         input_file (str): Path to the input file (CSV or Excel)
         output_prefix (str): Prefix for output CSV files
         batch_size (int): Number of rows per batch (including header)
+        dedupe (str): Optional duplicate policy ("keep_first", "keep_last" or "report")
+        conflict_report (str): Path for the duplicate/conflict report
+            (default: <output_prefix>_conflicts.csv when dedupe is set)
     """
     try:
         # Check file extension
@@ -110,20 +224,19 @@ def process_csv_in_batches(input_file, output_prefix="processed_data", batch_siz
 
         # Combine international code and whatsapp number
         # First, ensure the numbers are strings and remove any non-numeric characters
-        intl_codes = (
-            df[column_mapping["intl_code"]]
-            .astype(str)
-            .str.extract('(\d+)', expand=False)
-            .fillna('')
-        )
-        whatsapp_numbers = (
-            df[column_mapping["whatsapp"]]
-            .astype(str)
-            .str.extract('(\d+)', expand=False)
-            .fillna('')
-        )
+        intl_codes = phone_digits(df[column_mapping["intl_code"]])
+        whatsapp_numbers = phone_digits(df[column_mapping["whatsapp"]])
         processed_df["CONTACT_NUMBER"] = "+" + intl_codes + whatsapp_numbers
 
+        # Drop duplicate registrations before they are rendered and printed
+        if dedupe:
+            before = len(processed_df)
+            processed_df, conflicts = deduplicate_records(processed_df, dedupe)
+            report_file = conflict_report or f"{output_prefix}_conflicts.csv"
+            conflicts.to_csv(report_file, index=False)
+            print(f"Removed {before - len(processed_df)} duplicate records, "
+                  f"{len(conflicts)} entries in conflict report {report_file}")
+
         # Calculate number of batches needed
         total_rows = len(processed_df)
         num_batches = math.ceil(
@@ -152,12 +265,15 @@ def process_csv_in_batches(input_file, output_prefix="processed_data", batch_siz
 
 
 if __name__ == "__main__":
-    # Check if the script is called with an input file
-    if len(sys.argv) < 2:
-        print("Usage: python convert_data.py input_file.csv [output_prefix]")
-        sys.exit(1)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert registration data to the card CSV format")
+    parser.add_argument("input_file", help="Input CSV or Excel file")
+    parser.add_argument("output_prefix", nargs="?", default="processed_data", help="Prefix for output CSV files")
+    parser.add_argument("--dedupe", choices=DEDUPE_POLICIES, help="Duplicate handling policy")
+    parser.add_argument("--conflict-report", help="Path for the duplicate/conflict report CSV")
 
-    input_file = sys.argv[1]
-    output_prefix = sys.argv[2] if len(sys.argv) > 2 else "processed_data"
+    args = parser.parse_args()
 
-    process_csv_in_batches(input_file, output_prefix)
+    process_csv_in_batches(args.input_file, args.output_prefix, dedupe=args.dedupe,
+                           conflict_report=args.conflict_report)
@@ -11,6 +11,21 @@ from docx.enum.table import WD_ALIGN_VERTICAL
 from docx.shared import Inches
 from PIL import Image, ImageDraw, ImageFont
 import io
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from card_template import compile_template, DEFAULT_TEMPLATE
+from checkpoint import (run_fingerprint, load_manifest, save_manifest, completed_pages, append_overflows,
+                        restore_overflows, remove_checkpoint)
+from page_compositor import PageLayout, PageCompositor
+from ooxml_writer import OoxmlDocumentWriter
+from pipeline import run_pipeline
+from shm_transport import render_shared
+
+# A4 page with minimized margins
+PAGE_WIDTH = Cm(21.0)
+PAGE_HEIGHT = Cm(29.7)
+PAGE_MARGIN = Cm(0.8)
 
 def use_external_logo(logo_path='resources/logo.png', src_image=None):
     """Use an external logo image or create one if not provided."""
@@ -107,111 +122,11 @@ def add_horizontal_line(paragraph, color="C09B55"):
     pBdr.append(border)
     pPr.append(pBdr)
 
-def create_card_image(data, logo_path, output_path, card_width_px=800, card_height_px=400):
-    """Create a card image with the given data."""
-    # Create a new image with a white background
-    img = Image.new('RGB', (card_width_px, card_height_px), color='white')
-    draw = ImageDraw.Draw(img)
-    
-    # Load fonts
-    try:
-        # Try to use a custom font if available
-        header_font = ImageFont.truetype("resources/arial_bold.ttf", 30)
-        data_font = ImageFont.truetype("resources/arial.ttf", 24)
-        label_font = ImageFont.truetype("resources/arial_bold.ttf", 20)
-    except IOError:
-        # Fallback to default font
-        header_font = ImageFont.load_default()
-        data_font = ImageFont.load_default()
-        label_font = ImageFont.load_default()
-    
-    # Define colors
-    gold_color = (192, 155, 85)  # RGB for gold
-    text_color = (0, 0, 0)  # Black
-    
-    # Draw ornate golden border
-    border_width = 20
-    border_color = gold_color
-    draw.rectangle([0, 0, card_width_px-1, card_height_px-1], 
-                   outline=border_color, 
-                   width=border_width)
-    
-    # Draw decorative corner elements
-    corner_size = 50
-    corner_color = gold_color
-    # Top-left
-    draw.line([(0, 0), (corner_size, 0)], fill=corner_color, width=border_width//2)
-    draw.line([(0, 0), (0, corner_size)], fill=corner_color, width=border_width//2)
-    # Top-right
-    draw.line([(card_width_px-1, 0), (card_width_px-1-corner_size, 0)], fill=corner_color, width=border_width//2)
-    draw.line([(card_width_px-1, 0), (card_width_px-1, corner_size)], fill=corner_color, width=border_width//2)
-    # Bottom-left
-    draw.line([(0, card_height_px-1), (corner_size, card_height_px-1)], fill=corner_color, width=border_width//2)
-    draw.line([(0, card_height_px-1), (0, card_height_px-1-corner_size)], fill=corner_color, width=border_width//2)
-    # Bottom-right
-    draw.line([(card_width_px-1, card_height_px-1), (card_width_px-1-corner_size, card_height_px-1)], fill=corner_color, width=border_width//2)
-    draw.line([(card_width_px-1, card_height_px-1), (card_width_px-1, card_height_px-1-corner_size)], fill=corner_color, width=border_width//2)
-    
-    # Left side (text content)
-    left_width = int(card_width_px * 0.65)
-    
-    # Vertical positions for different fields
-    y_start = 80
-    line_height = 50
-    
-    # Fields to display
-    fields = [
-        ("LAABHARTHI NAME", data['LAABHARTHI_NAME']),
-        ("CONTACT NUMBER", data['CONTACT_NUMBER']),
-        ("ARPIT GROUP", data['ARPIT_GROUP']),
-        ("AREA", data['AREA'])
-    ]
-    
-    # Draw fields
-    for i, (label, value) in enumerate(fields):
-        # Draw label
-        draw.text((40, y_start + i*line_height), 
-                  label, 
-                  font=label_font, 
-                  fill=gold_color)
-        
-        # Draw value
-        draw.text((40, y_start + i*line_height + 35), 
-                  value, 
-                  font=data_font, 
-                  fill=text_color)
-        
-        # Draw horizontal line
-        line_y = y_start + (i+1)*line_height + 20
-        draw.line([(40, line_y), (left_width-40, line_y)], 
-                  fill=gold_color, 
-                  width=2)
-    
-    # Right side (logo and amount)
-    right_start_x = left_width
-    
-    # Add logo
-    if os.path.exists(logo_path):
-        logo = Image.open(logo_path)
-        # Resize logo to fit
-        logo_size = 250
-        logo = logo.resize((logo_size, logo_size), Image.LANCZOS)
-        
-        # Calculate logo position
-        logo_x = right_start_x + (card_width_px - right_start_x - logo_size) // 2
-        logo_y = 100
-        
-        # Paste logo
-        img.paste(logo, (logo_x, logo_y), logo if logo.mode == 'RGBA' else None)
-    
-    # Add amount text
-    amount_text = "Amount Rs. 1000/-"
-    amount_bbox = draw.textbbox((0, 0), amount_text, font=header_font)
-    amount_width = amount_bbox[2] - amount_bbox[0]
-    draw.text((right_start_x + (card_width_px - right_start_x - amount_width) // 2, 300), 
-              amount_text, 
-              font=header_font, 
-              fill=gold_color)
+def create_card_image(data, logo_path, output_path, card_width_px=800, card_height_px=400, plan=None, overflow=None):
+    """Create a card image with the given data, using a compiled template plan if provided."""
+    if plan is None:
+        plan = compile_template(None, logo_path, (card_width_px, card_height_px))
+    img = plan.render(data, overflow)
     
     # Ensure output directory exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -220,53 +135,262 @@ def create_card_image(data, logo_path, output_path, card_width_px=800, card_heig
     img.save(output_path)
     return output_path
 
-def generate_cards(csv_file, output_file, rows=4, cols=2, logo_path=None):
-    """Generate a Word document with card images."""
-    # Generate or use existing logo
+def resolve_logo(logo_path=None):
+    """Generate or use existing logo, returning the path the cards should use."""
     if logo_path and os.path.exists(logo_path):
-        final_logo_path = use_external_logo(src_image=logo_path)
-    else:
-        final_logo_path = create_circular_logo()
+        return use_external_logo(src_image=logo_path)
+    return create_circular_logo()
+
+def composite_layout(rows, cols, card_size):
+    """Grid layout of a composited page filling the printable area of the page."""
+    available_width = Pt(PAGE_WIDTH.pt - 2 * PAGE_MARGIN.pt)
+    # Slack below the grid so the picture never spills onto a new page
+    available_height = Pt(PAGE_HEIGHT.pt - 2 * PAGE_MARGIN.pt - Cm(0.5).pt)
+    return PageLayout(available_width.inches, available_height.inches, rows, cols, card_size)
+
+def write_overflow_report(overflows, report_file):
+    """Write the records whose fields had to be shrunk or truncated to a CSV file."""
+    pd.DataFrame(overflows, columns=['RECORD', 'LAABHARTHI_NAME', 'FIELD', 'TEXT', 'FONT_SIZE', 'TRUNCATED']).to_csv(report_file, index=False)
+
+def encode_image(img):
+    """Encode a card or page image (PIL image) as JPEG bytes."""
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+def read_pages(csv_file, per_page):
+    """Read the CSV in chunks, converting all columns to string, and yield (page_num, records) per page."""
+    page_num = 0
+    page_records = []
+    for chunk in pd.read_csv(csv_file, chunksize=per_page * 64):
+        for col in chunk.columns:
+            chunk[col] = chunk[col].astype(str)
+        for record in chunk.to_dict('records'):
+            page_records.append(record)
+            if len(page_records) == per_page:
+                yield page_num, page_records
+                page_records = []
+                page_num += 1
+    if page_records:
+        yield page_num, page_records
+
+def run_checkpointed(pages, render_page, assemble_page, temp_dir, fingerprint, per_page, composite_pages,
+                     resume=False, overflows=None):
+    """
+    Render every page to image files in temp_dir, then assemble the document from them.
+
+    A manifest in temp_dir records the completed pages after each page, so with
+    resume a run with the same fingerprint continues from its last completed
+    page. Overflow rows are appended to a log per completed page, and those of
+    the skipped pages are restored from it.
+
+    Returns:
+        The image files written to temp_dir
+    """
+    overflows = [] if overflows is None else overflows
+    manifest = {'fingerprint': fingerprint, 'completed_pages': 0, 'completed_cards': 0}
+    previous = load_manifest(temp_dir) if resume else None
+    previous_pages = (previous or {}).get('completed_pages', 0)
+    resumed_cards = (previous or {}).get('completed_cards', previous_pages * per_page)
+    
+    def page_images(page_num, num_cards=None):
+        """Image files making up a page: one composited page or one file per card."""
+        if composite_pages:
+            return [os.path.join(temp_dir, f'page_{page_num}.jpg')]
+        first = page_num * per_page
+        if num_cards is None:
+            num_cards = min(per_page, resumed_cards - first)
+        return [os.path.join(temp_dir, f'card_{i}.jpg') for i in range(first, first + num_cards)]
+    
+    start_page = 0
+    if resume:
+        start_page = completed_pages(previous, fingerprint, page_images)
+        if start_page is None:
+            print("Input or options changed since the interrupted run, starting from the beginning")
+            start_page = 0
+        elif start_page:
+            print(f"Resuming from page {start_page + 1}")
+    # Keep only the logged overflows of the pages that are not rendered again
+    overflows.extend(restore_overflows(temp_dir, start_page * per_page))
+    
+    # Render the remaining pages, checkpointing after each one
+    page_sizes = []
+    for page_num, page_records in pages:
+        page_sizes.append(len(page_records))
+        if page_num >= start_page:
+            noted = len(overflows)
+            for img, image_path in zip(render_page(page_num, page_records), page_images(page_num, len(page_records))):
+                img.save(image_path)
+            append_overflows(temp_dir, overflows[noted:])
+            manifest['completed_pages'] = page_num + 1
+            manifest['completed_cards'] = page_num * per_page + len(page_records)
+            save_manifest(temp_dir, manifest)
+    
+    # Process the rendered images into the document
+    image_files = []
+    for page_num, num_cards in enumerate(page_sizes):
+        image_files += page_images(page_num, num_cards)
+        assemble_page(page_num, page_images(page_num, num_cards))
+    return image_files
+
+def run_pipelined(pages, render_page, assemble_page, workers=2):
+    """
+    Read, render/encode (on worker threads) and assemble pages concurrently.
+
+    Encoded images are kept in memory rather than written to disk.
+
+    Returns:
+        PipelineStats of the run
+    """
+    def encode_page(page_num, page_records):
+        return [encode_image(img) for img in render_page(page_num, page_records)]
     
-    # Read CSV file
-    df = pd.read_csv(csv_file)
+    return run_pipeline(pages, encode_page, assemble_page, workers=workers)
+
+def run_multiprocess(pages, assemble_page, note_overflows, template_path, logo_path, card_size, per_page,
+                     layout=None, processes=2):
+    """
+    Render cards in worker processes and assemble the pages in this process.
+
+    Card pixels come back through shared memory and are composited onto the
+    page (if a layout is given) or encoded straight from their slots.
+    """
+    compositor = PageCompositor(layout) if layout else None
+    page_cards = []
+    num_cards = 0
+    
+    def add_page(page_num):
+        if compositor:
+            assemble_page(page_num, [encode_image(compositor.image())])
+            compositor.clear()
+        else:
+            assemble_page(page_num, page_cards[:])
+            page_cards.clear()
+    
+    def consume(index, record, card, fitted):
+        nonlocal num_cards
+        num_cards = index + 1
+        note_overflows(index, record, fitted)
+        position = index % per_page
+        if compositor:
+            compositor.place(position, card)
+        else:
+            page_cards.append(encode_image(Image.fromarray(card)))
+        if position == per_page - 1:
+            add_page(index // per_page)
+    
+    records = (record for page_num, page_records in pages for record in page_records)
+    render_shared(records, template_path, logo_path, card_size, consume, processes=processes)
+    if num_cards % per_page:
+        add_page(num_cards // per_page)
+
+def generate_cards(csv_file, output_file, rows=4, cols=2, logo_path=None, template_path=None, composite_pages=False,
+                   overflow_report=None, resume=False, writer='python-docx', pipelined=False, workers=2,
+                   processes=0, temp_dir=None):
+    """
+    Generate a Word document with card images.
+
+    With composite_pages, every page is composited into a single image instead
+    of embedding each card as its own picture in a table. Records whose fields
+    had to be shrunk to fit are listed in overflow_report (CSV) if given.
+
+    writer selects how the document is assembled: 'python-docx' builds it through
+    the python-docx object model, 'ooxml' streams the XML and images straight
+    into the .docx zip, which is much faster for large batches.
+
+    The CSV is always read in chunks. One of three executors renders the pages:
+    - by default (run_checkpointed), pages are rendered to image files in
+      temp_dir (default: temp_card_images next to the output file) and
+      checkpointed page by page; with resume, an interrupted run continues from
+      its last completed page, provided the input CSV, options, template and
+      logo match
+    - with pipelined (run_pipelined), reading, rendering/encoding (on `workers`
+      threads) and assembly run concurrently and images stay in memory
+    - with processes (run_multiprocess), cards are rendered in that many worker
+      processes which write the pixels into a shared memory slab
+    resume and temp_dir only apply to the default executor.
+    """
+    if (pipelined or processes) and resume:
+        raise ValueError("resume is not supported with the pipelined or multi-process executors")
+    if pipelined and processes:
+        raise ValueError("choose either pipelined (threads) or processes, not both")
+    if writer not in ('python-docx', 'ooxml'):
+        raise ValueError(f"Unknown writer {writer!r}, expected 'python-docx' or 'ooxml'")
     
-    # Convert all columns to string
-    for col in df.columns:
-        df[col] = df[col].astype(str)
+    # Generate or use existing logo
+    final_logo_path = resolve_logo(logo_path)
+    
+    # Compile the card template once; every record reuses the same plan
+    plan = compile_template(template_path, final_logo_path)
     
     # Create document
     doc = Document()
     
     # Set page size to A4 and minimized margins
     section = doc.sections[0]
-    section.page_height = Cm(29.7)  # A4 height
-    section.page_width = Cm(21.0)   # A4 width
-    section.left_margin = Cm(0.8)   # Further reduced margins
-    section.right_margin = Cm(0.8)
-    section.top_margin = Cm(0.8)
-    section.bottom_margin = Cm(0.8)
-    
-    # Calculate available space on the page (in points)
-    available_width = Pt(section.page_width.pt - section.left_margin.pt - section.right_margin.pt)
-    available_height = Pt(section.page_height.pt - section.top_margin.pt - section.bottom_margin.pt)
-
-    # Create a temporary directory for card images
-    temp_dir = os.path.join(os.path.dirname(output_file), 'temp_card_images')
-    os.makedirs(temp_dir, exist_ok=True)
-    
-    # Generate card images
-    card_images = []
-    for i, record in enumerate(df.to_dict('records')):
-        # Generate unique filename for each card image
-        card_image_path = os.path.join(temp_dir, f'card_{i}.jpg')
-        create_card_image(record, final_logo_path, card_image_path)
-        card_images.append(card_image_path)
-    
-    # Process card images into the document
-    for i in range(0, len(card_images), rows * cols):
+    section.page_height = PAGE_HEIGHT
+    section.page_width = PAGE_WIDTH
+    section.left_margin = PAGE_MARGIN
+    section.right_margin = PAGE_MARGIN
+    section.top_margin = PAGE_MARGIN
+    section.bottom_margin = PAGE_MARGIN
+    
+    per_page = rows * cols
+    layout = composite_layout(rows, cols, plan.size) if composite_pages else None
+    compositors = threading.local()  # page buffers are per thread
+    
+    # Fields that had to be shrunk or truncated, one row per field
+    overflows = []
+    def note_overflows(i, record, fitted):
+        for entry in fitted:
+            overflows.append([i, record.get('LAABHARTHI_NAME', ''), entry['column'], entry['text'],
+                              entry['font_size'], entry['truncated']])
+    
+    def render_page(page_num, page_records):
+        """Render a page: one composited page image or one image per card."""
+        first = page_num * per_page
+        cards = []
+        for j, record in enumerate(page_records):
+            fitted = []
+            cards.append(plan.render(record, fitted))
+            note_overflows(first + j, record, fitted)
+        if composite_pages:
+            # Composite each page into a single image: one encode and one picture per page
+            if not hasattr(compositors, 'compositor'):
+                compositors.compositor = PageCompositor(layout)
+            cards = [compositors.compositor.compose(cards)]
+        return cards
+    
+    # The OOXML writer streams into the output file, so it is only opened
+    # once the first page is ready to be assembled
+    ooxml = None
+    def open_ooxml():
+        return OoxmlDocumentWriter(output_file, section.page_width, section.page_height,
+                                   section.left_margin, section.right_margin,
+                                   section.top_margin, section.bottom_margin)
+    
+    def assemble_page(page_num, images):
+        """Add a page of images (file paths or encoded bytes) to the document."""
+        nonlocal ooxml
+        if writer == 'ooxml':
+            if ooxml is None:
+                ooxml = open_ooxml()
+            if composite_pages:
+                ooxml.add_page_image(images[0], (layout.width_px, layout.grid_height_px), Inches(layout.width_in))
+            else:
+                ooxml.add_card_table(images, rows, cols, plan.size, Inches(2.5))
+            return
+        
+        images = [io.BytesIO(image) if isinstance(image, bytes) else image for image in images]
+        if composite_pages:
+            paragraph = doc.add_paragraph()
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            paragraph.paragraph_format.page_break_before = page_num > 0
+            paragraph.add_run().add_picture(images[0], width=Inches(layout.width_in))
+            return
+        
         # Add a new page if not the first page
-        if i > 0:
+        if page_num > 0:
             doc.add_page_break()
         
         # Create a table to hold the images
@@ -275,32 +399,167 @@ def generate_cards(csv_file, output_file, rows=4, cols=2, logo_path=None):
         table.autofit = False
         
         # Fill the table with images
-        for r in range(rows):
-            for c in range(cols):
-                # Calculate the image index
-                img_index = i + r * cols + c
-                
-                # Break if we've run out of images
-                if img_index >= len(card_images):
-                    break
-                
-                # Get the cell and add the image
-                cell = table.cell(r, c)
-                cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-                
-                # Add image to the cell
-                cell.paragraphs[0].add_run().add_picture(card_images[img_index], width=Inches(2.5))
+        for img_index, card_image in enumerate(images):
+            # Get the cell and add the image
+            cell = table.cell(img_index // cols, img_index % cols)
+            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            # Add image to the cell
+            cell.paragraphs[0].add_run().add_picture(card_image, width=Inches(2.5))
+    
+    pages = read_pages(csv_file, per_page)
+    if pipelined:
+        stats = run_pipelined(pages, render_page, assemble_page, workers)
+        print(stats.report())
+    elif processes:
+        run_multiprocess(pages, assemble_page, note_overflows, template_path, final_logo_path, plan.size,
+                         per_page, layout, processes)
+    else:
+        # Create a temporary directory for card images and the checkpoint
+        temp_dir = temp_dir or os.path.join(os.path.dirname(output_file), 'temp_card_images')
+        os.makedirs(temp_dir, exist_ok=True)
+        fingerprint = run_fingerprint(
+            csv_file,
+            {'rows': rows, 'cols': cols, 'composite_pages': composite_pages},
+            [template_path or DEFAULT_TEMPLATE, final_logo_path])
+        image_files = run_checkpointed(pages, render_page, assemble_page, temp_dir, fingerprint, per_page, composite_pages,
+                         resume, overflows)
     
     # Save the document
-    doc.save(output_file)
+    if writer == 'ooxml':
+        (ooxml or open_ooxml()).save()
+    else:
+        doc.save(output_file)
     
-    # Clean up temporary image files
-    for img_path in card_images:
-        os.remove(img_path)
-    os.rmdir(temp_dir)
+    if not (pipelined or processes):
+        # Clean up temporary image files and the checkpoint
+        remove_checkpoint(temp_dir, image_files)
+    
+    if overflows:
+        # Render threads may report out of record order
+        overflows.sort(key=lambda row: row[0])
+        print(f"{len(set(row[0] for row in overflows))} card(s) had fields shrunk to fit")
+        if overflow_report:
+            write_overflow_report(overflows, overflow_report)
+            print(f"Overflow report saved to {overflow_report}")
     
     print(f"Cards generated successfully and saved to {output_file}")
 
+def group_file_name(key):
+    """File name stem for a group key, e.g. ('Group A', 'Delhi') -> 'Group_A_Delhi'."""
+    return "_".join("".join(c if c.isalnum() else "_" for c in part) for part in key)
+
+def group_value(value):
+    """Group key part of a cell, with blank cells (NaN or whitespace) grouped as 'Unassigned'."""
+    if pd.isna(value) or not str(value).strip():
+        return 'Unassigned'
+    return str(value).strip()
+
+def partition_records(csv_file, group_by):
+    """
+    Split the CSV records into groups in a single pass, keeping the CSV order within each group.
+
+    Returns:
+        (columns, groups): the CSV columns and a dict of group key -> records
+        (all columns as strings)
+    """
+    groups = {}
+    columns = None
+    for chunk in pd.read_csv(csv_file, chunksize=10000):
+        columns = list(chunk.columns)
+        missing = [col for col in group_by if col not in chunk.columns]
+        if missing:
+            raise ValueError(f"Group columns not found in CSV: {missing}")
+        # Keys come from the raw cells: older pandas turn blanks into 'nan' strings
+        keys = list(zip(*(chunk[col].map(group_value) for col in group_by)))
+        for col in chunk.columns:
+            chunk[col] = chunk[col].astype(str)
+        for key, record in zip(keys, chunk.to_dict('records')):
+            groups.setdefault(key, []).append(record)
+    return columns, groups
+
+def group_report_path(overflow_report, name):
+    """Per group overflow report path, e.g. ('overflows.csv', 'Group_A') -> 'overflows_Group_A.csv'."""
+    root, ext = os.path.splitext(overflow_report)
+    return f"{root}_{name}{ext or '.csv'}"
+
+def generate_grouped_cards(csv_file, output_dir, group_by=('ARPIT_GROUP',), jobs=None, rows=4, cols=2,
+                           logo_path=None, overflow_report=None, **options):
+    """
+    Generate one Word document per group of records, building the groups in parallel.
+
+    The input is read once and partitioned by the group_by columns (e.g.
+    ARPIT_GROUP and/or AREA), keeping the CSV order within each group. Each
+    group's document is then generated in its own process, and an index.csv
+    listing the cards and pages of every group is written to output_dir.
+
+    Args:
+        csv_file: Input CSV file
+        output_dir: Directory for the group documents and the index
+        group_by: Columns to group by
+        jobs: Number of groups built at the same time (default: number of CPUs)
+        overflow_report: Base path of the per group overflow reports, e.g.
+            overflows.csv -> overflows_Group_A.csv
+        options: Further generate_cards() options (template_path, composite_pages, writer, pipelined, ...).
+            processes and resume are not supported: the groups already run in separate
+            processes and their temporary files are not kept.
+    Returns:
+        Path of the index file
+    """
+    unsupported = [name for name in ('processes', 'resume') if options.get(name)]
+    if unsupported:
+        raise ValueError(f"Not supported with grouped documents: {', '.join(unsupported)}")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Resolve the logo once: the groups must not all copy it at the same time
+    resolve_logo(logo_path)
+    
+    # Partition the records in a single pass over the input
+    columns, groups = partition_records(csv_file, group_by)
+    
+    group_dir = os.path.join(output_dir, 'temp_groups')
+    os.makedirs(group_dir, exist_ok=True)
+    try:
+        # One CSV and one document per group; names are made unique if sanitising collides
+        jobs_args = []
+        used_names = set()
+        for key in sorted(groups):
+            name = group_file_name(key)
+            stem, n = name, 2
+            while name.lower() in used_names:
+                name = f"{stem}_{n}"
+                n += 1
+            used_names.add(name.lower())
+            
+            group_csv = os.path.join(group_dir, f'{name}.csv')
+            pd.DataFrame(groups[key], columns=columns).to_csv(group_csv, index=False)
+            jobs_args.append((key, name, group_csv, os.path.join(output_dir, f'{name}.docx')))
+        
+        # Build the groups in parallel; each gets its own temporary image directory.
+        # The resolved logo (resources/logo.png) is picked up by every group.
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(generate_cards, group_csv, group_output, rows, cols, None,
+                                temp_dir=os.path.join(group_dir, f'temp_{name}'),
+                                overflow_report=overflow_report and group_report_path(overflow_report, name),
+                                **options)
+                for key, name, group_csv, group_output in jobs_args
+            ]
+            for future in futures:
+                future.result()
+        
+        # Index of the generated documents
+        per_page = rows * cols
+        index = [list(key) + [len(groups[key]), -(-len(groups[key]) // per_page), os.path.basename(group_output)]
+                 for key, name, group_csv, group_output in jobs_args]
+        index_file = os.path.join(output_dir, 'index.csv')
+        pd.DataFrame(index, columns=list(group_by) + ['CARDS', 'PAGES', 'FILE']).to_csv(index_file, index=False)
+    finally:
+        shutil.rmtree(group_dir, ignore_errors=True)
+    
+    print(f"Generated {len(jobs_args)} group documents, index saved to {index_file}")
+    return index_file
+
 if __name__ == "__main__":
     import argparse
     
@@ -310,6 +569,22 @@ if __name__ == "__main__":
     parser.add_argument('--rows', type=int, default=4, help='Number of rows per page')
     parser.add_argument('--cols', type=int, default=2, help='Number of columns per page')
     parser.add_argument('--logo', type=str, help='Path to custom logo image')
+    parser.add_argument('--template', type=str, help='Path to a card template (JSON), default: templates/default_card.json')
+    parser.add_argument('--overflow-report', type=str, help='CSV file listing cards whose fields were shrunk or truncated')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted run from its last completed page')
+    parser.add_argument('--writer', choices=['python-docx', 'ooxml'], default='python-docx',
+                        help='Document writer: python-docx, or ooxml to write the .docx directly (faster)')
+    parser.add_argument('--pipelined', action='store_true', help='Overlap reading, rendering and document assembly')
+    parser.add_argument('--workers', type=int, default=2, help='Render threads for --pipelined (default: 2)')
+    parser.add_argument('--processes', type=int, default=0,
+                        help='Render in this many worker processes, sharing card buffers through shared memory')
+    parser.add_argument('--group-by', nargs='+', choices=['ARPIT_GROUP', 'AREA'],
+                        help='Write one document per group into the --output directory, with an index.csv')
+    parser.add_argument('--jobs', type=int, help='Groups built in parallel with --group-by (default: number of CPUs)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep watching the CSV and update the document whenever it is saved')
+    parser.add_argument('--interval', type=float, default=1.0, help='Seconds between checks with --watch (default: 1)')
+    parser.add_argument('--composite-pages', action='store_true', help='Composite each page into a single image (faster to open and print)')
     
     args = parser.parse_args()
     
@@ -325,9 +600,26 @@ if __name__ == "__main__":
     if not os.path.isabs(args.output):
         args.output = os.path.join(os.path.dirname(__file__), args.output)
         
+    if args.watch:
+        from watch_cards import watch_cards
+        watch_cards(args.csv, args.output, args.interval, rows=args.rows, cols=args.cols, logo_path=args.logo,
+                    template_path=args.template, composite_pages=args.composite_pages)
+        exit(0)
+    
+    if args.group_by:
+        if args.processes or args.resume:
+            parser.error("--processes and --resume cannot be used with --group-by")
+        generate_grouped_cards(args.csv, args.output, args.group_by, args.jobs, args.rows, args.cols, args.logo,
+                               args.overflow_report, template_path=args.template,
+                               composite_pages=args.composite_pages, writer=args.writer,
+                               pipelined=args.pipelined, workers=args.workers)
+        exit(0)
+    
     # Create output directory if it doesn't exist
     output_dir = os.path.dirname(args.output)
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
         
-    generate_cards(args.csv, args.output, args.rows, args.cols, args.logo) 
\ No newline at end of file
+    generate_cards(args.csv, args.output, args.rows, args.cols, args.logo, args.template, args.composite_pages,
+                   args.overflow_report, args.resume, args.writer, args.pipelined, args.workers,
+                   args.processes) 
\ No newline at end of file
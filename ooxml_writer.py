@@ -0,0 +1,222 @@
+import zipfile
+import tempfile
+from xml.sax.saxutils import escape
+
+# EMU (English Metric Units) per twip: 914400 EMU per inch, 1440 twips per inch
+EMU_PER_TWIP = 635
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Default Extension="jpeg" ContentType="image/jpeg"/>'
+    '<Default Extension="png" ContentType="image/png"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/word/settings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>'
+    '</Types>'
+)
+
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+# Same document defaults and "Table Grid" style as the python-docx default template,
+# so both writers lay the cards out identically
+STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri"/>'
+    '<w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="en-US"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="200" w:line="276" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+    '</w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>'
+    '<w:style w:type="table" w:default="1" w:styleId="TableNormal"><w:name w:val="Normal Table"/>'
+    '<w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblCellMar><w:top w:w="0" w:type="dxa"/>'
+    '<w:left w:w="108" w:type="dxa"/><w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/>'
+    '</w:tblCellMar></w:tblPr></w:style>'
+    '<w:style w:type="table" w:styleId="TableGrid"><w:name w:val="Table Grid"/><w:basedOn w:val="TableNormal"/>'
+    '<w:pPr><w:spacing w:after="0" w:line="240" w:lineRule="auto"/></w:pPr>'
+    '<w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblBorders>'
+    '<w:top w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    '<w:left w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    '<w:bottom w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    '<w:right w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    '<w:insideH w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    '<w:insideV w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+    '</w:tblBorders><w:tblCellMar><w:top w:w="0" w:type="dxa"/><w:left w:w="108" w:type="dxa"/>'
+    '<w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style>'
+    '</w:styles>'
+)
+
+# Same compatibility settings as the python-docx default template, so Word
+# does not open the document in Compatibility Mode
+SETTINGS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:settings xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:defaultTabStop w:val="720"/><w:characterSpacingControl w:val="doNotCompress"/>'
+    '<w:compat><w:useFELayout/>'
+    '<w:compatSetting w:name="compatibilityMode" w:uri="http://schemas.microsoft.com/office/word" w:val="14"/>'
+    '<w:compatSetting w:name="overrideTableStyleFontSizeAndJustification" '
+    'w:uri="http://schemas.microsoft.com/office/word" w:val="1"/>'
+    '<w:compatSetting w:name="enableOpenTypeFeatures" w:uri="http://schemas.microsoft.com/office/word" w:val="1"/>'
+    '<w:compatSetting w:name="doNotFlipMirrorIndents" w:uri="http://schemas.microsoft.com/office/word" w:val="1"/>'
+    '</w:compat><w:doNotAutoCompressPictures/>'
+    '<w:decimalSymbol w:val="."/><w:listSeparator w:val=","/></w:settings>'
+)
+
+DOCUMENT_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"><w:body>'
+)
+
+SECTION = (
+    '<w:sectPr><w:pgSz w:w="{width}" w:h="{height}"/>'
+    '<w:pgMar w:top="{top}" w:right="{right}" w:bottom="{bottom}" w:left="{left}" '
+    'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr></w:body></w:document>'
+)
+
+PICTURE = (
+    '<w:r><w:drawing><wp:inline distT="0" distB="0" distL="0" distR="0">'
+    '<wp:extent cx="{cx}" cy="{cy}"/><wp:docPr id="{id}" name="Picture {id}"/>'
+    '<wp:cNvGraphicFramePr><a:graphicFrameLocks noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+    '<pic:pic><pic:nvPicPr><pic:cNvPr id="0" name="{name}"/><pic:cNvPicPr/></pic:nvPicPr>'
+    '<pic:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+    '<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"/></pic:spPr></pic:pic></a:graphicData></a:graphic>'
+    '</wp:inline></w:drawing></w:r>'
+)
+
+PAGE_BREAK = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+
+class OoxmlDocumentWriter:
+    """
+    Write a card document straight into a .docx zip without python-docx.
+
+    Images are stored in the zip as soon as they are added and document.xml is
+    streamed to a temporary file from precomputed XML templates, so assembly
+    time is linear in the number of cards.
+
+    Page geometry is given in EMU (python-docx Length values can be passed as is).
+    """
+
+    def __init__(self, output_file, page_width, page_height, left_margin, right_margin, top_margin, bottom_margin):
+        self.zip = zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED)
+        self.zip.writestr('[Content_Types].xml', CONTENT_TYPES)
+        self.zip.writestr('_rels/.rels', PACKAGE_RELS)
+        self.zip.writestr('word/styles.xml', STYLES)
+        self.zip.writestr('word/settings.xml', SETTINGS)
+        self.body = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self.body.write(DOCUMENT_START)
+        self.rels = []
+        self.pages = 0
+        self.text_width = (page_width - left_margin - right_margin) // EMU_PER_TWIP
+        self.section = SECTION.format(
+            width=page_width // EMU_PER_TWIP, height=page_height // EMU_PER_TWIP,
+            top=top_margin // EMU_PER_TWIP, right=right_margin // EMU_PER_TWIP,
+            bottom=bottom_margin // EMU_PER_TWIP, left=left_margin // EMU_PER_TWIP)
+        self._table_start = {}
+
+    def _picture(self, image, size_px, width_emu):
+        """Store an image part and return the inline drawing XML referencing it."""
+        num = len(self.rels) + 1
+        rid = f'rId{num}'
+        name = f'image{num}.jpeg'
+        if isinstance(image, bytes):
+            self.zip.writestr(f'word/media/{name}', image)
+        else:
+            self.zip.write(image, f'word/media/{name}')
+        self.rels.append((rid, name))
+        width_px, height_px = size_px
+        # Height rounded the way python-docx scales pictures
+        height_emu = int(round(width_emu * height_px / width_px))
+        return PICTURE.format(cx=width_emu, cy=height_emu, id=num, name=name, rid=rid)
+
+    def _table_xml(self, rows, cols):
+        """Opening XML of a rows x cols table and its cell template, built once per grid size."""
+        if (rows, cols) not in self._table_start:
+            col_width = self.text_width // cols
+            grid = ''.join(f'<w:gridCol w:w="{col_width}"/>' for _ in range(cols))
+            start = ('<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:type="auto" w:w="0"/>'
+                     '<w:tblLayout w:type="fixed"/><w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0" '
+                     'w:firstColumn="1" w:lastColumn="0" w:noHBand="0" w:noVBand="1"/></w:tblPr>'
+                     f'<w:tblGrid>{grid}</w:tblGrid>')
+            cell = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width}"/></w:tcPr><w:p>{{}}</w:p></w:tc>'
+            self._table_start[(rows, cols)] = (start, cell)
+        return self._table_start[(rows, cols)]
+
+    def add_card_table(self, images, rows, cols, size_px, width_emu):
+        """
+        Add a page holding a rows x cols table of card images.
+
+        Args:
+            images: Card images (file paths or encoded bytes) in row-major order
+            size_px: (width, height) of the card images in pixels
+            width_emu: Display width of each card
+        """
+        if self.pages:
+            self.body.write(PAGE_BREAK)
+        start, cell = self._table_xml(rows, cols)
+        parts = [start]
+        for r in range(rows):
+            parts.append('<w:tr>')
+            for c in range(cols):
+                index = r * cols + c
+                if index < len(images):
+                    content = '<w:pPr><w:jc w:val="center"/></w:pPr>' + self._picture(images[index], size_px, width_emu)
+                else:
+                    content = ''
+                parts.append(cell.format(content))
+            parts.append('</w:tr>')
+        parts.append('</w:tbl>')
+        self.body.write(''.join(parts))
+        self.pages += 1
+
+    def add_page_image(self, image, size_px, width_emu):
+        """Add a page holding a single centered image (e.g. a composited page)."""
+        page_break = '<w:pageBreakBefore/>' if self.pages else ''
+        self.body.write(f'<w:p><w:pPr>{page_break}<w:jc w:val="center"/></w:pPr>'
+                        f'{self._picture(image, size_px, width_emu)}</w:p>')
+        self.pages += 1
+
+    def save(self):
+        """Write the remaining parts and close the zip."""
+        self.body.write(self.section)
+        self.body.seek(0)
+        with self.zip.open('word/document.xml', 'w') as part:
+            for chunk in iter(lambda: self.body.read(1 << 16), ''):
+                part.write(chunk.encode('utf-8'))
+        self.body.close()
+
+        rels = ''.join(
+            f'<Relationship Id="{rid}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" '
+            f'Target="media/{escape(name)}"/>'
+            for rid, name in self.rels)
+        styles_rid = f'rId{len(self.rels) + 1}'
+        settings_rid = f'rId{len(self.rels) + 2}'
+        self.zip.writestr('word/_rels/document.xml.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{rels}<Relationship Id="{styles_rid}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+            'Target="styles.xml"/>'
+            f'<Relationship Id="{settings_rid}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" '
+            'Target="settings.xml"/></Relationships>'))
+        self.zip.close()
@@ -0,0 +1,91 @@
+import numpy as np
+from PIL import Image
+
+# Rendering resolution of a card: 800px across a 2.5 inch picture
+CARD_WIDTH_INCHES = 2.5
+# Vertical gap between card rows, roughly the table cell padding
+ROW_GAP_INCHES = 0.1
+
+
+class PageLayout:
+    """Grid geometry for compositing rows x cols cards onto one page image."""
+
+    def __init__(self, width_in, height_in, rows, cols, card_size, card_width_in=CARD_WIDTH_INCHES):
+        self.rows = rows
+        self.cols = cols
+        self.width_in = width_in
+        self.height_in = height_in
+
+        card_w_px, card_h_px = card_size
+        self.dpi = card_w_px / card_width_in
+        self.width_px = int(width_in * self.dpi)
+        self.height_px = int(height_in * self.dpi)
+
+        # Same grid as the table layout: equal column widths across the page,
+        # cards centered in their column and rows stacked from the top.
+        # Cards are shrunk only if the grid would not fit on the page.
+        gap = int(ROW_GAP_INCHES * self.dpi)
+        cell_w = self.width_px // cols
+        scale = min(1.0, cell_w / card_w_px, (self.height_px // rows - gap) / card_h_px)
+        self.card_w = int(card_w_px * scale)
+        self.card_h = int(card_h_px * scale)
+        row_pitch = self.card_h + gap
+        self.positions = [
+            (c*cell_w + (cell_w - self.card_w) // 2, r*row_pitch + gap // 2)
+            for r in range(rows) for c in range(cols)
+        ]
+        # Only the rows of the grid are encoded, not the blank rest of the page
+        self.grid_height_px = min(self.height_px, rows*row_pitch)
+
+    @property
+    def cards_per_page(self):
+        return self.rows * self.cols
+
+
+class PageCompositor:
+    """Tile card images into a preallocated page buffer, one image per page."""
+
+    def __init__(self, layout, background=255):
+        self.layout = layout
+        self.background = background
+        self.page = np.full((layout.grid_height_px, layout.width_px, 3), background, dtype=np.uint8)
+
+    def place(self, position, card):
+        """
+        Copy one card into its grid position on the page buffer.
+
+        Args:
+            position: Index of the card on the page, in row-major order
+            card: PIL image or HxWx3 uint8 array (e.g. a shared memory view)
+        """
+        layout = self.layout
+        x, y = layout.positions[position]
+        if isinstance(card, np.ndarray):
+            if card.shape[:2] != (layout.card_h, layout.card_w):
+                card = Image.fromarray(card)
+        if isinstance(card, Image.Image):
+            if card.size != (layout.card_w, layout.card_h):
+                card = card.resize((layout.card_w, layout.card_h), Image.LANCZOS)
+            card = np.asarray(card.convert('RGB'))
+        self.page[y:y+layout.card_h, x:x+layout.card_w] = card
+
+    def clear(self):
+        self.page.fill(self.background)
+
+    def image(self):
+        """PIL Image of the current page buffer."""
+        return Image.fromarray(self.page)
+
+    def compose(self, cards):
+        """
+        Composite up to rows*cols cards onto the page buffer.
+
+        Args:
+            cards: Card images (PIL images or HxWx3 uint8 arrays) in row-major order
+        Returns:
+            PIL Image of the whole page
+        """
+        self.clear()
+        for position, card in enumerate(cards[:self.layout.cards_per_page]):
+            self.place(position, card)
+        return self.image()
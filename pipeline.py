@@ -0,0 +1,188 @@
+import time
+import queue
+import threading
+
+# Sentinel marking the end of a queue's stream
+DONE = object()
+
+
+class StageStats:
+    """Busy time and item count of one pipeline stage."""
+
+    def __init__(self, name, threads=1):
+        self.name = name
+        self.threads = threads
+        self.busy = 0.0
+        self.items = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.busy += seconds
+            self.items += 1
+
+    def utilisation(self, wall):
+        return self.busy / (wall * self.threads) if wall else 0.0
+
+
+class PipelineStats:
+    """Per-stage utilisation and sampled queue depths of a pipeline run."""
+
+    def __init__(self, stages, queues):
+        self.stages = {stage.name: stage for stage in stages}
+        self.queues = queues
+        self.depths = {name: [] for name in queues}
+        self.wall = 0.0
+
+    def sample(self):
+        for name, q in self.queues.items():
+            self.depths[name].append(q.qsize())
+
+    def report(self):
+        """Human readable summary; the busiest stage is the bottleneck."""
+        lines = [f"Pipeline finished in {self.wall:.2f}s"]
+        for stage in self.stages.values():
+            lines.append(f"  {stage.name:<10} {stage.items:>6} items  "
+                         f"busy {stage.busy:>7.2f}s  utilisation {stage.utilisation(self.wall):>4.0%}")
+        for name, depths in self.depths.items():
+            if depths:
+                q = self.queues[name]
+                lines.append(f"  queue {name:<10} mean depth {sum(depths) / len(depths):>4.1f}  "
+                             f"max {max(depths)}/{q.maxsize}")
+        bottleneck = max(self.stages.values(), key=lambda s: s.utilisation(self.wall))
+        lines.append(f"  bottleneck: {bottleneck.name}")
+        return "\n".join(lines)
+
+
+def _put(q, item, stop):
+    """Put with backpressure, giving up if the pipeline is being stopped."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _acquire(semaphore, stop):
+    """Acquire with backpressure, giving up if the pipeline is being stopped."""
+    while not stop.is_set():
+        if semaphore.acquire(timeout=0.1):
+            return True
+    return False
+
+
+def run_pipeline(pages, render_page, assemble_page, workers=2, queue_size=4):
+    """
+    Run reading, rendering/encoding and assembly concurrently.
+
+    The reader fills a bounded work queue from pages, render workers turn each
+    page into encoded images and pass them on through a bounded results queue,
+    and the assembler (the calling thread) adds pages to the document in order.
+    At most 2 * queue_size pages are in flight between reading and assembly
+    (queued, rendering or waiting to be reassembled in order), which caps how
+    many encoded cards are held in memory even when one page is slow.
+
+    Args:
+        pages: Iterable of (page_num, records), in page order
+        render_page: Function (page_num, records) -> encoded page images
+        assemble_page: Function (page_num, images) adding a page to the document
+        workers: Number of render threads
+        queue_size: Capacity (in pages) of each queue; also sets the in-flight limit
+    Returns:
+        PipelineStats for the run
+    """
+    work_q = queue.Queue(maxsize=queue_size)
+    done_q = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    in_flight = threading.BoundedSemaphore(queue_size * 2)
+    errors = []
+
+    read_stats = StageStats('read')
+    render_stats = StageStats('render', workers)
+    assemble_stats = StageStats('assemble')
+    stats = PipelineStats([read_stats, render_stats, assemble_stats], {'work': work_q, 'results': done_q})
+
+    def reader():
+        try:
+            it = iter(pages)
+            while True:
+                start = time.perf_counter()
+                page = next(it, DONE)
+                if page is DONE:
+                    break
+                read_stats.record(time.perf_counter() - start)
+                if not _acquire(in_flight, stop) or not _put(work_q, page, stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            for _ in range(workers):
+                _put(work_q, DONE, stop)
+
+    def worker():
+        try:
+            while not stop.is_set():
+                try:
+                    page = work_q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if page is DONE:
+                    break
+                page_num, records = page
+                start = time.perf_counter()
+                images = render_page(page_num, records)
+                render_stats.record(time.perf_counter() - start)
+                if not _put(done_q, (page_num, images), stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(done_q, DONE, stop)
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=reader, daemon=True)]
+    threads += [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+
+    # Assemble in page order; pages finished early wait in the reorder buffer,
+    # which is bounded by the in-flight limit
+    pending = {}
+    next_page = 0
+    finished_workers = 0
+    try:
+        while finished_workers < workers and not stop.is_set():
+            stats.sample()
+            try:
+                item = done_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is DONE:
+                finished_workers += 1
+                continue
+            pending[item[0]] = item[1]
+            while next_page in pending:
+                start = time.perf_counter()
+                assemble_page(next_page, pending.pop(next_page))
+                assemble_stats.record(time.perf_counter() - start)
+                in_flight.release()
+                next_page += 1
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
+    if pending:
+        raise RuntimeError(f"Pipeline ended with pages missing before page {min(pending)}")
+
+    stats.wall = time.perf_counter() - start_time
+    return stats
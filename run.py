@@ -19,6 +19,7 @@ def check_dependencies():
         import pandas
         import docx
         import PIL
+        import numpy
         return True
     except ImportError as e:
         missing_package = str(e).split("'")[1]
@@ -0,0 +1,154 @@
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+
+from card_template import compile_template
+
+# Per worker process state, set up once by _init_worker
+_worker = {}
+
+
+class SlabPool:
+    """
+    A slab of shared memory divided into fixed-size slots of one card each.
+
+    Slots are handed out by the parent and recycled once their card has been
+    consumed; running out of free slots is what throttles the workers.
+    """
+
+    def __init__(self, slots, shape, name=None):
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.slot_bytes = int(np.prod(self.shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * self.slot_bytes)
+            self.owner = True
+        else:
+            # Workers share the parent's resource tracker, which keeps
+            # ownership (and the unlink) with the parent
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.array = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+        self.free = list(range(slots))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def view(self, slot):
+        """Zero-copy HxWx3 view of a slot."""
+        return self.array[slot]
+
+    def acquire(self):
+        return self.free.pop()
+
+    def release(self, slot):
+        self.free.append(slot)
+
+    def close(self):
+        # Views must be dropped before the buffer can be released
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _init_worker(template_path, logo_path, pool_name, slots, shape):
+    """Compile the render plan and attach to the slab once per worker process."""
+    _worker['plan'] = compile_template(template_path, logo_path)
+    _worker['pool'] = SlabPool(slots, shape, name=pool_name)
+
+
+def _render_worker(init_args, tasks, results):
+    """Render records straight into their assigned slots until told to stop."""
+    _init_worker(*init_args)
+    plan, pool = _worker['plan'], _worker['pool']
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            index, record, slot = task
+            try:
+                fitted = []
+                img = plan.render(record, fitted)
+                np.copyto(pool.view(slot), np.asarray(img))
+                results.put((index, slot, fitted, None))
+            except Exception as e:
+                results.put((index, slot, None, repr(e)))
+    finally:
+        pool.close()
+
+
+def render_shared(records, template_path, logo_path, card_size, consume, processes=2, slots=None):
+    """
+    Render records in worker processes and hand the cards to consume() in order.
+
+    Workers write pixels into a shared memory slab; only the record, its slot
+    number and any overflow entries cross the process boundary. consume receives
+    a zero-copy view of each card, which is only valid during the call: the slot
+    is recycled as soon as consume returns.
+
+    Args:
+        records: Iterable of record dicts
+        template_path: Card template (None for the default)
+        logo_path: Logo image for the template
+        card_size: (width, height) of the rendered cards
+        consume: Function (index, record, card_array, overflow_entries) called in record order
+        processes: Number of worker processes
+        slots: Number of shared slots, i.e. cards in flight (default: 4 per process)
+    """
+    width, height = card_size
+    pool = SlabPool(slots or 4 * processes, (height, width, 3))
+    tasks = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    init_args = (template_path, logo_path, pool.name, pool.slots, pool.shape)
+    workers = [multiprocessing.Process(target=_render_worker, args=(init_args, tasks, results), daemon=True)
+               for _ in range(processes)]
+    for w in workers:
+        w.start()
+
+    pending = {}
+    in_flight_records = {}
+    next_index = 0
+    in_flight = 0
+
+    def collect():
+        """Wait for one finished card and consume every card that is now in order."""
+        nonlocal next_index, in_flight
+        while True:
+            try:
+                index, slot, fitted, error = results.get(timeout=1)
+                break
+            except queue.Empty:
+                if any(w.exitcode not in (None, 0) for w in workers):
+                    raise RuntimeError("A render worker process exited unexpectedly")
+        in_flight -= 1
+        if error:
+            raise RuntimeError(f"Rendering record {index} failed: {error}")
+        pending[index] = (slot, fitted)
+        while next_index in pending:
+            slot, fitted = pending.pop(next_index)
+            consume(next_index, in_flight_records.pop(next_index), pool.view(slot), fitted)
+            pool.release(slot)
+            next_index += 1
+
+    try:
+        for index, record in enumerate(records):
+            # Backpressure: wait for the parent to consume cards until a slot is free
+            while not pool.free:
+                collect()
+            in_flight_records[index] = record
+            tasks.put((index, record, pool.acquire()))
+            in_flight += 1
+        while in_flight:
+            collect()
+    finally:
+        for w in workers:
+            tasks.put(None)
+        for w in workers:
+            w.join(timeout=5)
+            if w.is_alive():
+                w.terminate()
+        pool.close()
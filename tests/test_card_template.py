@@ -0,0 +1,70 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from card_template import FontCache
+
+# Not shipped: exercises the sized default font fallback
+FONT = "resources/arial.ttf"
+NAMES = [
+    "Ramesh Kumar Venkataraman",
+    "Lakshmi Narayanan Subramanian Iyer",
+    "Raghavendra Krishnamurthy Sita Devi Kumar",
+    "Meera Nair Venkataraman Subramanian Iyer",
+]
+
+
+@pytest.mark.parametrize("text", NAMES)
+def test_fit_uses_the_largest_size_that_fits(text):
+    cache = FontCache()
+    max_width = cache.width(FONT, 24, text) * 0.8
+    font, fitted, size, truncated = cache.fit(text, FONT, 24, max_width, 10)
+    assert not truncated and fitted == text
+    assert 10 <= size < 24
+    assert cache.width(FONT, size, text) <= max_width
+    assert cache.width(FONT, size + 1, text) > max_width
+
+
+def test_fit_truncates_below_the_minimum_size():
+    cache = FontCache()
+    text = "X" * 200
+    font, fitted, size, truncated = cache.fit(text, FONT, 24, 300, 14)
+    assert truncated and size == 14
+    assert fitted.endswith("...") and cache.width(FONT, 14, fitted) <= 300
+
+
+def test_fit_keeps_text_that_fits():
+    assert FontCache().fit("Asha", FONT, 24, 300, 14)[1:] == ("Asha", 24, False)
+
+
+def test_width_cache_is_bounded():
+    cache = FontCache(max_widths=3)
+    for i in range(10):
+        cache.width(FONT, 12, str(i))
+    assert [key[2] for key in cache.widths] == ["7", "8", "9"]
+
+
+def test_default_template_fields_do_not_overlap():
+    with open("templates/default_card.json") as f:
+        template = json.load(f)
+    fields, fonts = template["fields"], template["fonts"]
+    width, height = template["size"]
+    border = template["layers"][0]["width"]
+    cache = FontCache()
+
+    def extent(top, font, text):
+        bbox = cache.font(fonts[font]["path"], fonts[font]["size"]).getbbox(text)
+        return top + bbox[1], top + bbox[3]
+
+    bottom = border
+    for i, slot in enumerate(fields["slots"]):
+        y = fields["y"] + i * fields["line_height"]
+        label = extent(y, fields["label_font"], slot["label"])
+        value = extent(y + fields["value_offset"], fields["value_font"], "Ayg 0123")
+        rule = fields["y"] + (i + 1) * fields["line_height"] + fields["rule_offset"]
+        assert bottom < label[0] < label[1] < value[0] < value[1] < rule
+        bottom = rule
+    assert bottom < height - border
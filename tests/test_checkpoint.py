@@ -0,0 +1,105 @@
+import os
+import sys
+import zipfile
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import card_template
+from checkpoint import load_manifest
+from generate_cards import generate_cards
+
+NUM_RECORDS = 20  # 2 full pages of 8 and a partial page of 4
+
+
+class Interrupted(Exception):
+    pass
+
+
+def write_csv(path, num_records=NUM_RECORDS):
+    names = [f"Card {i}" for i in range(num_records)]
+    names[3] = "Ramesh Kumar Venkataraman Subramanian Iyer Krishnamurthy"  # overflows
+    pd.DataFrame({"LAABHARTHI_NAME": names, "CONTACT_NUMBER": [str(9000000000 + i) for i in range(num_records)],
+                  "ARPIT_GROUP": "Group A", "AREA": "Delhi"}).to_csv(path, index=False)
+    return str(path)
+
+
+def media(path):
+    with zipfile.ZipFile(path) as z:
+        return [z.read(name) for name in sorted(z.namelist()) if name.startswith("word/media/")]
+
+
+@pytest.fixture
+def count_renders(monkeypatch):
+    """Count card renders, raising Interrupted at the given render number."""
+    calls = {"n": 0, "fail_at": None}
+    render = card_template.RenderPlan.render
+
+    def counting(self, data, overflow=None):
+        calls["n"] += 1
+        if calls["n"] == calls["fail_at"]:
+            raise Interrupted
+        return render(self, data, overflow)
+
+    monkeypatch.setattr(card_template.RenderPlan, "render", counting)
+    return calls
+
+
+def interrupt(csv_file, output_file, count_renders, fail_at, **options):
+    count_renders["fail_at"] = fail_at
+    with pytest.raises(Interrupted):
+        generate_cards(csv_file, output_file, writer="ooxml", **options)
+    count_renders.update(n=0, fail_at=None)
+
+
+@pytest.mark.parametrize("composite_pages", [False, True])
+def test_resume_after_a_mid_page_failure(tmp_path, count_renders, composite_pages):
+    csv_file = write_csv(tmp_path / "in.csv")
+    generate_cards(csv_file, str(tmp_path / "full.docx"), writer="ooxml", composite_pages=composite_pages,
+                   overflow_report=str(tmp_path / "full.csv"))
+    count_renders["n"] = 0
+
+    # Fail on the 4th card of the second page
+    output_file = str(tmp_path / "out.docx")
+    interrupt(csv_file, output_file, count_renders, 12, composite_pages=composite_pages)
+    manifest = load_manifest(str(tmp_path / "temp_card_images"))
+    assert (manifest["completed_pages"], manifest["completed_cards"]) == (1, 8)
+
+    generate_cards(csv_file, output_file, writer="ooxml", composite_pages=composite_pages, resume=True,
+                   overflow_report=str(tmp_path / "resumed.csv"))
+    assert count_renders["n"] == NUM_RECORDS - 8
+    assert media(output_file) == media(str(tmp_path / "full.docx"))
+    # The overflow of record 3 was rendered before the interruption
+    assert (tmp_path / "resumed.csv").read_text() == (tmp_path / "full.csv").read_text()
+    assert not os.path.exists(tmp_path / "temp_card_images")
+
+
+def test_changed_input_restarts_from_the_beginning(tmp_path, count_renders, capsys):
+    csv_file = write_csv(tmp_path / "in.csv")
+    output_file = str(tmp_path / "out.docx")
+    interrupt(csv_file, output_file, count_renders, 12)
+
+    write_csv(csv_file, NUM_RECORDS + 1)
+    generate_cards(csv_file, output_file, writer="ooxml", resume=True)
+    assert "starting from the beginning" in capsys.readouterr().out
+    assert count_renders["n"] == NUM_RECORDS + 1
+
+
+def test_missing_images_are_rendered_again(tmp_path, count_renders):
+    csv_file = write_csv(tmp_path / "in.csv")
+    output_file = str(tmp_path / "out.docx")
+    interrupt(csv_file, output_file, count_renders, 20)  # after 2 completed pages
+    os.remove(tmp_path / "temp_card_images" / "card_9.jpg")
+
+    generate_cards(csv_file, output_file, writer="ooxml", resume=True)
+    assert count_renders["n"] == NUM_RECORDS - 8
+
+
+def test_cleanup_keeps_unrelated_files(tmp_path):
+    temp_dir = tmp_path / "temp_card_images"
+    temp_dir.mkdir()
+    (temp_dir / "notes.txt").write_text("keep me")
+
+    generate_cards(write_csv(tmp_path / "in.csv"), str(tmp_path / "out.docx"), writer="ooxml")
+    assert os.listdir(temp_dir) == ["notes.txt"]
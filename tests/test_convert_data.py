@@ -0,0 +1,117 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from convert_data import (normalize_contact, normalize_name, deduplicate_records, phone_digits,
+                          process_csv_in_batches)
+
+
+def make_df(rows):
+    return pd.DataFrame(rows, columns=["ID", "NAME", "CONTACT_NUMBER"])
+
+
+@pytest.mark.parametrize("number", ["+91 98765-43210", "919876543210", "9876543210", "+919876543210"])
+def test_normalize_contact_drops_formatting_and_country_code(number):
+    assert normalize_contact(number) == "9876543210"
+
+
+@pytest.mark.parametrize("number", ["+91", "+", "", None, float("nan"), "12345"])
+def test_normalize_contact_treats_short_numbers_as_missing(number):
+    assert normalize_contact(number) == ""
+
+
+def test_phone_digits_keeps_every_digit():
+    values = pd.Series(["98765-43210", "98765 43210", 9876543210.0, float("nan"), "+91"])
+    assert list(phone_digits(values)) == ["9876543210", "9876543210", "9876543210", "", "91"]
+
+
+def test_normalize_name():
+    assert normalize_name("  Raj   K. Kumar ") == normalize_name("raj k kumar") == "raj k kumar"
+    assert normalize_name(None) == ""
+
+
+def test_keep_first_drops_later_duplicates():
+    df = make_df([
+        ["1", "Raj Kumar", "+919876543210"],
+        ["2", "Asha Rao", "+919000000001"],
+        ["3", "raj  kumar", "+91 98765 43210"],
+    ])
+    result, report = deduplicate_records(df, "keep_first")
+    assert list(result["ID"]) == ["1", "2"]
+    assert report[["KIND", "ROW", "MATCHES_ROW", "ACTION"]].values.tolist() == [["duplicate", 2, 0, "dropped"]]
+    assert report[["ID", "MATCHES_ID"]].values.tolist() == [["3", "1"]]
+
+
+def test_keep_last_keeps_latest_row_in_first_position():
+    df = make_df([
+        ["1", "Raj Kumar", "+919876543210"],
+        ["2", "Asha Rao", "+919000000001"],
+        ["3", "Raj Kumar", "9876543210"],
+    ])
+    result, report = deduplicate_records(df, "keep_last")
+    assert list(result["ID"]) == ["3", "2"]
+    assert report[["KIND", "ROW", "MATCHES_ROW", "CONTACT_NUMBER", "ACTION"]].values.tolist() == [
+        ["duplicate", 0, 2, "+919876543210", "dropped"]]
+    assert report[["ID", "MATCHES_ID"]].values.tolist() == [["1", "3"]]
+
+
+def test_report_keeps_every_row():
+    df = make_df([
+        ["1", "Raj Kumar", "+919876543210"],
+        ["2", "Raj Kumar", "+919876543210"],
+    ])
+    result, report = deduplicate_records(df, "report")
+    assert list(result["ID"]) == ["1", "2"]
+    assert report[["KIND", "ROW", "MATCHES_ROW", "ACTION"]].values.tolist() == [["duplicate", 1, 0, "kept"]]
+
+
+def test_shared_contact_with_different_name_is_a_conflict():
+    df = make_df([
+        ["1", "Raj Kumar", "+919876543210"],
+        ["2", "Sita Kumar", "+919876543210"],
+    ])
+    result, report = deduplicate_records(df, "keep_first")
+    assert list(result["ID"]) == ["1", "2"]
+    assert report[["KIND", "ROW", "MATCHES_ROW", "ACTION"]].values.tolist() == [["contact_conflict", 1, 0, "kept"]]
+
+
+@pytest.mark.parametrize("policy", ["keep_first", "keep_last", "report"])
+def test_records_without_contact_are_never_duplicates(policy):
+    df = make_df([
+        ["1", "Raj Kumar", "+91"],
+        ["2", "Raj Kumar", "+91"],
+        ["3", "Asha Rao", None],
+    ])
+    result, report = deduplicate_records(df, policy)
+    assert list(result["ID"]) == ["1", "2", "3"]
+    assert report.empty
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        deduplicate_records(make_df([]), "keep_all")
+
+
+def test_process_csv_dedupes_differently_formatted_numbers(tmp_path):
+    input_file = tmp_path / "registrations.csv"
+    pd.DataFrame({
+        "id": [1, 2, 3],
+        "first_name": ["raj", "Raj", "Sita"],
+        "last_name": ["kumar", "Kumar", "Rao"],
+        "arpit_group": ["a", "a", "b"],
+        "area": ["delhi", "Delhi", "pune"],
+        "Int'l Calling code (e.g. US 1, UK 44)": ["+91", "91", "91"],
+        "whatsapp": ["98765-43210", "9876543210", "98765 11111"],
+    }).to_csv(input_file, index=False)
+    prefix = str(tmp_path / "out")
+
+    assert process_csv_in_batches(str(input_file), prefix, dedupe="keep_first")
+
+    result = pd.read_csv(f"{prefix}_batch_1.csv", dtype=str)
+    assert list(result["ID"]) == ["1", "3"]
+    assert list(result["CONTACT_NUMBER"]) == ["+919876543210", "+919876511111"]
+    report = pd.read_csv(f"{prefix}_conflicts.csv", dtype=str)
+    assert report[["KIND", "ID", "MATCHES_ID", "ACTION"]].values.tolist() == [["duplicate", "2", "1", "dropped"]]
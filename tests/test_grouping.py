@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pandas as pd
+from docx import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generate_cards import partition_records, generate_grouped_cards, group_report_path
+
+RECORDS = [
+    ["Asha Rao", "9000000001", "Group A", "Delhi"],
+    ["Raj Kumar", "9000000002", "", "Delhi"],
+    ["Sita Devi", "9000000003", "Group B", "Pune"],
+    ["Anil Shah", "9000000004", "Group A", "Pune"],
+    ["Meera Nair Venkataraman Subramanian Iyer Krishnamurthy", "9000000005", "  ", "Delhi"],
+]
+
+
+def write_csv(path):
+    pd.DataFrame(RECORDS, columns=["LAABHARTHI_NAME", "CONTACT_NUMBER", "ARPIT_GROUP", "AREA"]).to_csv(
+        path, index=False)
+    return str(path)
+
+
+def test_partition_groups_blank_cells_as_unassigned(tmp_path):
+    columns, groups = partition_records(write_csv(tmp_path / "in.csv"), ("ARPIT_GROUP",))
+    assert columns == ["LAABHARTHI_NAME", "CONTACT_NUMBER", "ARPIT_GROUP", "AREA"]
+    assert sorted(groups) == [("Group A",), ("Group B",), ("Unassigned",)]
+    # CSV order is kept within a group
+    assert [r["LAABHARTHI_NAME"] for r in groups[("Group A",)]] == ["Asha Rao", "Anil Shah"]
+    assert [r["CONTACT_NUMBER"] for r in groups[("Unassigned",)]] == ["9000000002", "9000000005"]
+
+
+def test_partition_by_two_columns(tmp_path):
+    _, groups = partition_records(write_csv(tmp_path / "in.csv"), ("ARPIT_GROUP", "AREA"))
+    assert {key: len(records) for key, records in groups.items()} == {
+        ("Group A", "Delhi"): 1, ("Group A", "Pune"): 1, ("Group B", "Pune"): 1, ("Unassigned", "Delhi"): 2}
+
+
+def test_grouped_documents_and_index(tmp_path):
+    output_dir = tmp_path / "groups"
+    report = str(tmp_path / "overflows.csv")
+    index_file = generate_grouped_cards(write_csv(tmp_path / "in.csv"), str(output_dir), ("ARPIT_GROUP",),
+                                        jobs=2, rows=1, cols=1, overflow_report=report, writer="ooxml")
+
+    index = pd.read_csv(index_file)
+    assert index.values.tolist() == [
+        ["Group A", 2, 2, "Group_A.docx"],
+        ["Group B", 1, 1, "Group_B.docx"],
+        ["Unassigned", 2, 2, "Unassigned.docx"],
+    ]
+    for file_name, cards in zip(index["FILE"], index["CARDS"]):
+        assert len(Document(str(output_dir / file_name)).inline_shapes) == cards
+    assert not os.path.exists(output_dir / "temp_groups")
+    # Only the group with the long name has an overflow report
+    assert os.path.exists(group_report_path(report, "Unassigned"))
+    assert not os.path.exists(group_report_path(report, "Group_A"))
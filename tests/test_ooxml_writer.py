@@ -0,0 +1,68 @@
+import os
+import sys
+import zipfile
+
+import pandas as pd
+import pytest
+from docx import Document
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generate_cards import generate_cards
+
+
+def write_csv(path, num_records=11):
+    pd.DataFrame({"LAABHARTHI_NAME": [f"Card {i}" for i in range(num_records)],
+                  "CONTACT_NUMBER": [str(9000000000 + i) for i in range(num_records)],
+                  "ARPIT_GROUP": "Group A", "AREA": "Delhi"}).to_csv(path, index=False)
+    return str(path)
+
+
+def describe(path):
+    """Page geometry, tables, pictures and page breaks of a document as python-docx reads it."""
+    doc = Document(path)
+    section = doc.sections[0]
+    body = doc.element.body
+    return {
+        "page": (section.page_width, section.page_height, section.left_margin, section.right_margin,
+                 section.top_margin, section.bottom_margin),
+        "tables": [(len(table.rows), len(table.columns), table.style.name) for table in doc.tables],
+        "pictures": [(shape.width, shape.height) for shape in doc.inline_shapes],
+        "page_breaks": (len(body.xpath('.//w:br[@w:type="page"]'))
+                        + len(body.xpath('.//w:pageBreakBefore[not(@w:val="0")]'))),
+    }
+
+
+@pytest.mark.parametrize("composite_pages", [False, True])
+def test_ooxml_matches_python_docx(tmp_path, composite_pages):
+    csv_file = write_csv(tmp_path / "in.csv")
+    docs = {}
+    for writer in ("python-docx", "ooxml"):
+        docs[writer] = str(tmp_path / f"{writer}.docx")
+        generate_cards(csv_file, docs[writer], writer=writer, composite_pages=composite_pages)
+
+    expected = describe(docs["python-docx"])
+    assert describe(docs["ooxml"]) == expected
+    # 11 cards on 2 pages
+    assert expected["page_breaks"] == 1
+    assert len(expected["pictures"]) == (2 if composite_pages else 11)
+    assert len(expected["tables"]) == (0 if composite_pages else 2)
+
+
+def test_ooxml_package(tmp_path):
+    output_file = str(tmp_path / "out.docx")
+    generate_cards(write_csv(tmp_path / "in.csv"), output_file, writer="ooxml")
+
+    settings = Document(output_file).settings.element.xml
+    assert 'w:name="compatibilityMode"' in settings and 'w:val="14"' in settings
+    with zipfile.ZipFile(output_file) as z:
+        media = [info for info in z.infolist() if info.filename.startswith("word/media/")]
+        assert len(media) == 11
+        assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in media)
+
+
+def test_empty_input_gives_an_empty_document(tmp_path):
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text("LAABHARTHI_NAME,CONTACT_NUMBER,ARPIT_GROUP,AREA\n")
+    output_file = str(tmp_path / "out.docx")
+    generate_cards(str(csv_file), output_file, writer="ooxml")
+    assert describe(output_file)["pictures"] == []
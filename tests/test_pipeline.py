@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipeline import run_pipeline
+
+
+def pages(count):
+    return ((page_num, [page_num]) for page_num in range(count))
+
+
+def test_pages_are_assembled_in_order():
+    def render(page_num, records):
+        # Later pages finish first
+        time.sleep(0.01 * (page_num % 3))
+        return [f"image {page_num}"]
+
+    assembled = []
+    stats = run_pipeline(pages(30), render, lambda page_num, images: assembled.append((page_num, images)),
+                         workers=3, queue_size=2)
+    assert assembled == [(n, [f"image {n}"]) for n in range(30)]
+    assert stats.stages["render"].items == 30
+    assert stats.stages["assemble"].items == 30
+
+
+@pytest.mark.parametrize("stage", ["read", "render", "assemble"])
+def test_errors_are_raised_to_the_caller(stage):
+    def read():
+        for page in pages(50):
+            if stage == "read" and page[0] == 7:
+                raise KeyError("read failed")
+            yield page
+
+    def render(page_num, records):
+        if stage == "render" and page_num == 7:
+            raise KeyError("render failed")
+        return []
+
+    def assemble(page_num, images):
+        if stage == "assemble" and page_num == 7:
+            raise KeyError("assemble failed")
+
+    with pytest.raises(KeyError, match=f"{stage} failed"):
+        run_pipeline(read(), render, assemble, workers=2)
+    # No thread is left running
+    assert not [t for t in threading.enumerate() if t.daemon and t.is_alive()]
+
+
+def test_slow_page_does_not_buffer_the_rest():
+    lock = threading.Lock()
+    held = {"now": 0, "peak": 0}
+
+    def render(page_num, records):
+        if page_num == 0:
+            time.sleep(0.5)
+        with lock:
+            held["now"] += 1
+            held["peak"] = max(held["peak"], held["now"])
+        return [page_num]
+
+    def assemble(page_num, images):
+        with lock:
+            held["now"] -= 1
+
+    run_pipeline(pages(200), render, assemble, workers=2, queue_size=3)
+    assert held["peak"] <= 2 * 3
@@ -0,0 +1,180 @@
+import os
+import time
+import json
+import hashlib
+import pandas as pd
+from PIL import Image
+from docx.shared import Inches
+
+from card_template import compile_template, DEFAULT_TEMPLATE
+from checkpoint import file_digest
+from ooxml_writer import OoxmlDocumentWriter
+from page_compositor import PageCompositor
+from generate_cards import resolve_logo, composite_layout, PAGE_WIDTH, PAGE_HEIGHT, PAGE_MARGIN
+
+
+class CardWatcher:
+    """
+    Keep a card document up to date with its CSV, re-rendering only what changed.
+
+    Rendered cards are cached on disk under a hash of their content, so after
+    an edit only new or changed records are rendered. With composite_pages,
+    pages are cached as well and a page whose cards changed (or moved) is
+    recomposited from the cached cards. The document itself is then
+    reassembled from the cache with the direct OOXML writer.
+    """
+
+    def __init__(self, csv_file, output_file, rows=4, cols=2, logo_path=None, template_path=None,
+                 composite_pages=False):
+        self.csv_file = csv_file
+        self.output_file = output_file
+        self.rows = rows
+        self.cols = cols
+        self.composite_pages = composite_pages
+        # One cache per document, so watchers of other documents keep theirs
+        stem = os.path.splitext(os.path.basename(output_file))[0]
+        self.cache_dir = os.path.join(os.path.dirname(output_file), f'card_cache_{stem}')
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        final_logo_path = resolve_logo(logo_path)
+        self.plan = compile_template(template_path, final_logo_path)
+        if composite_pages:
+            self.layout = composite_layout(rows, cols, self.plan.size)
+            self.compositor = PageCompositor(self.layout)
+
+        # Cached cards are only valid for the same template and logo,
+        # cached pages also for the same grid
+        salt = hashlib.sha256()
+        salt.update(file_digest(template_path or DEFAULT_TEMPLATE).encode())
+        salt.update(file_digest(final_logo_path).encode())
+        self.salt = salt.hexdigest()
+        self.page_salt = json.dumps([rows, cols])
+
+        # Snapshot of the last build: one key per record and per page
+        self.card_keys = []
+        self.page_keys = []
+
+    def read_records(self):
+        df = pd.read_csv(self.csv_file)
+        for col in df.columns:
+            df[col] = df[col].astype(str)
+        return df.to_dict('records')
+
+    def card_key(self, record):
+        content = json.dumps(record, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1((self.salt + content).encode('utf-8')).hexdigest()
+
+    def cache_path(self, kind, key):
+        return os.path.join(self.cache_dir, f'{kind}_{key}.jpg')
+
+    def update(self):
+        """
+        Diff the CSV against the previous snapshot and rebuild the document.
+
+        Returns:
+            dict with the number of changed and removed records, rendered
+            cards and rebuilt pages
+        """
+        records = self.read_records()
+        card_keys = [self.card_key(record) for record in records]
+        per_page = self.rows * self.cols
+        pages = [card_keys[i:i + per_page] for i in range(0, len(card_keys), per_page)]
+        page_keys = [hashlib.sha1((self.page_salt + ''.join(keys)).encode()).hexdigest() for keys in pages]
+
+        previous = set(self.card_keys)
+        current = set(card_keys)
+        previous_pages = set(self.page_keys)
+        stats = {
+            'changed': sum(1 for key in card_keys if key not in previous),
+            'removed': sum(1 for key in self.card_keys if key not in current),
+            'rendered': 0,
+            'pages': sum(1 for key in page_keys if key not in previous_pages),
+        }
+
+        # Render only the cards that are not cached yet
+        for record, key in zip(records, card_keys):
+            card_path = self.cache_path('card', key)
+            if not os.path.exists(card_path):
+                self.plan.render(record).save(card_path)
+                stats['rendered'] += 1
+
+        # Recomposite only the pages that are not cached yet, from the cached cards
+        if self.composite_pages:
+            for page_key, keys in zip(page_keys, pages):
+                page_path = self.cache_path('page', page_key)
+                if not os.path.exists(page_path):
+                    cards = [Image.open(self.cache_path('card', key)) for key in keys]
+                    self.compositor.compose(cards).save(page_path)
+
+        self.write_document(pages, page_keys)
+
+        # Drop cached images that are no longer part of the document; pages
+        # are only pruned in composite mode so switching modes keeps them
+        keep = {f'card_{key}.jpg' for key in card_keys}
+        if self.composite_pages:
+            keep |= {f'page_{key}.jpg' for key in page_keys}
+        for name in os.listdir(self.cache_dir):
+            if name not in keep and (self.composite_pages or name.startswith('card_')):
+                os.remove(os.path.join(self.cache_dir, name))
+
+        self.card_keys = card_keys
+        self.page_keys = page_keys
+        return stats
+
+    def write_document(self, pages, page_keys):
+        """Assemble the document from the cache, replacing the output in one step."""
+        tmp_file = self.output_file + '.tmp'
+        writer = OoxmlDocumentWriter(tmp_file, PAGE_WIDTH, PAGE_HEIGHT,
+                                     PAGE_MARGIN, PAGE_MARGIN, PAGE_MARGIN, PAGE_MARGIN)
+        for keys, page_key in zip(pages, page_keys):
+            if self.composite_pages:
+                writer.add_page_image(self.cache_path('page', page_key),
+                                      (self.layout.width_px, self.layout.grid_height_px),
+                                      Inches(self.layout.width_in))
+            else:
+                writer.add_card_table([self.cache_path('card', key) for key in keys],
+                                      self.rows, self.cols, self.plan.size, Inches(2.5))
+        writer.save()
+        try:
+            os.replace(tmp_file, self.output_file)
+        except PermissionError:
+            # Typically the document is open in Word (Windows locks open files)
+            print(f"Could not replace {self.output_file} (is it open?), latest version saved to {tmp_file}")
+
+
+def watch_cards(csv_file, output_file, interval=1.0, **options):
+    """
+    Watch csv_file and regenerate output_file whenever it is saved.
+
+    Args:
+        csv_file: CSV file to watch
+        output_file: Word document kept up to date
+        interval: Seconds between checks of the CSV file
+        options: CardWatcher options (rows, cols, logo_path, template_path, composite_pages)
+    """
+    watcher = CardWatcher(csv_file, output_file, **options)
+    last_seen = None
+    print(f"Watching {csv_file} for changes (press Ctrl+C to stop)")
+    try:
+        while True:
+            try:
+                stat = os.stat(csv_file)
+                seen = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                seen = None
+
+            if seen and seen != last_seen:
+                last_seen = seen
+                start = time.perf_counter()
+                try:
+                    stats = watcher.update()
+                except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError, OSError) as e:
+                    # Often a save that is still in progress; the next save triggers a rebuild
+                    print(f"Could not read {csv_file}: {e}")
+                else:
+                    print(f"{stats['changed']} new/changed and {stats['removed']} removed records: "
+                          f"rendered {stats['rendered']} cards, {stats['pages']} pages changed, "
+                          f"saved {output_file} in {time.perf_counter() - start:.2f}s")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Stopped watching")